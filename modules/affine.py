@@ -0,0 +1,125 @@
+"""
+Affine Module for Geometry Package
+
+Affine transforms of the plane, used to move whole polygons
+(see SimplePolygon.transform).
+"""
+import math
+from array import array
+
+import numpy
+
+
+def as_points(coordinates):
+    """
+    Returns coordinates as an (n, 2) float NumPy array.  A flat
+    array('d') buffer [x0, y0, x1, y1, ...] is viewed in place, without
+    copying; a sequence of (x, y) pairs or a flat sequence is converted.
+    """
+    if isinstance(coordinates, array) and coordinates.typecode == 'd':
+        return numpy.frombuffer(coordinates, dtype = float).reshape(-1, 2)
+    return numpy.asarray(coordinates, dtype = float).reshape(-1, 2)
+
+
+class AffineTransform(object):
+    """
+    An affine map of the plane, stored as the top two rows of its
+    3x3 matrix:
+
+        [a b c]         x' = a*x + b*y + c
+        [d e f]         y' = d*x + e*y + f
+        [0 0 1]
+
+    Transforms compose (see then), so any chain of rotations, scales
+    and translations collapses into one transform that is applied to
+    a coordinate buffer in a single pass.
+    """
+
+    def __init__(self, a = 1.0, b = 0.0, c = 0.0, d = 0.0, e = 1.0, f = 0.0):
+        self.matrix = (1.0*a, 1.0*b, 1.0*c, 1.0*d, 1.0*e, 1.0*f)
+
+    """ The following build the common transforms """
+
+    @classmethod
+    def identity(cls):
+        return cls()
+
+
+    @classmethod
+    def translation(cls, translation_vector):
+        return cls(1, 0, translation_vector[0], 0, 1, translation_vector[1])
+
+
+    @classmethod
+    def rotation(cls, radians, point = (0, 0)):
+        """
+        Counter-clockwise rotation by radians about point.  The sine
+        and cosine are worked out once here rather than per vertice.
+        """
+        cos, sin = math.cos(radians), math.sin(radians)
+        return cls(cos, -sin, point[0] - cos*point[0] + sin*point[1],
+                   sin,  cos, point[1] - sin*point[0] - cos*point[1])
+
+
+    @classmethod
+    def scaling(cls, scale_x, scale_y = None, point = (0, 0)):
+        """ Scales away from point, uniformly unless scale_y is given """
+        scale_y = scale_x if scale_y is None else scale_y
+        return cls(scale_x, 0, point[0] - scale_x*point[0],
+                   0, scale_y, point[1] - scale_y*point[1])
+
+    """ The following are for combining and inspecting transforms """
+
+    def then(self, other):
+        """ Returns the transform applying self first, then other """
+        return other * self
+
+
+    def __mul__(self, other):
+        """
+        Matrix product, so (self * other) applies other first.  Only
+        the top two rows are multiplied since the last is always
+        [0 0 1].
+        """
+        a1, b1, c1, d1, e1, f1 = self.matrix
+        a2, b2, c2, d2, e2, f2 = other.matrix
+        return AffineTransform(a1*a2 + b1*d2, a1*b2 + b1*e2, a1*c2 + b1*f2 + c1,
+                               d1*a2 + e1*d2, d1*b2 + e1*e2, d1*c2 + e1*f2 + f1)
+
+
+    def determinant(self):
+        """
+        Zero means the plane is flattened onto a line, and a negative
+        value means the transform mirrors, reversing orientation.
+        """
+        a, b, _, d, e, _ = self.matrix
+        return a*e - b*d
+
+    """ The following apply the transform """
+
+    def apply(self, coordinate):
+        a, b, c, d, e, f = self.matrix
+        x, y = coordinate[0], coordinate[1]
+        return (a*x + b*y + c, d*x + e*y + f)
+
+
+    def apply_buffer(self, flat):
+        """
+        Applies the transform to a flat buffer [x0, y0, x1, y1, ...]
+        (or a sequence of (x, y) pairs, see as_points) as one matrix
+        product over the (n, 2) points, returning a new array('d').
+        """
+        a, b, c, d, e, f = self.matrix
+        points = as_points(flat).dot(numpy.array([[a, d], [b, e]]))
+        points += (c, f)
+        return array('d', points.tobytes())
+
+
+    def __eq__(self, other):
+        return isinstance(other, AffineTransform) and self.matrix == other.matrix
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return 'AffineTransform%r' % (self.matrix,)
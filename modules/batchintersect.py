@@ -0,0 +1,123 @@
+"""
+Batch Intersection Module for Geometry Package
+
+Tests many pairs of line segments at once with NumPy, for the
+candidate pairs coming out of a sweep or a spatial broad phase.
+"""
+import numpy
+
+
+def as_segments(segments):
+    """
+    (k, 2, 2) float array from k segments of form [(x1,y1), (x2,y2)],
+    or from an array already shaped that way (used without copying).
+    """
+    array = numpy.asarray(segments, dtype = float)
+    if array.size == 0:
+        return array.reshape(0, 2, 2)
+    if array.ndim != 3 or array.shape[1:] != (2, 2):
+        raise ValueError('Segments must have shape (k, 2, 2)')
+    return array
+
+
+def _cross(u, v):
+    return u[..., 0]*v[..., 1] - u[..., 1]*v[..., 0]
+
+
+def _orientation(p, q, r):
+    """ lineintersection.orientation over arrays of points """
+    return numpy.sign(_cross(q - p, r - p))
+
+
+def _same(p, q):
+    return (p == q).all(axis = -1)
+
+
+def _kernel(A, B, parameters):
+    """
+    segments_intersect for segments A and B, which broadcast against
+    each other in all but their last two axes.  With parameters, also
+    the position t along A and u along B of a single crossing point,
+    and the point itself, NaN where there isn't one.
+    """
+    P1, P2 = A[..., 0, :], A[..., 1, :]
+    Q1, Q2 = B[..., 0, :], B[..., 1, :]
+    o1, o2 = _orientation(P1, P2, Q1), _orientation(P1, P2, Q2)
+    o3, o4 = _orientation(Q1, Q2, P1), _orientation(Q1, Q2, P2)
+    shared = _same(P1, Q1) | _same(P1, Q2) | _same(P2, Q1) | _same(P2, Q2)
+    flags  = (o1 != o2) & (o3 != o4) & ~shared
+
+    collinear = (o1 == 0) & (o2 == 0) & (o3 == 0) & (o4 == 0)
+    if collinear.any():
+        """
+        Along a line, order by x is lexicographic order unless the
+        line is vertical (all four x equal), see segments_intersect.
+        """
+        along_x = ((P1[..., 0] != P2[..., 0]) | (P1[..., 0] != Q1[..., 0]) |
+                   (P1[..., 0] != Q2[..., 0]))
+        take    = lambda point: numpy.where(along_x, point[..., 0], point[..., 1])
+        p1, p2, q1, q2 = take(P1), take(P2), take(Q1), take(Q2)
+        low     = numpy.maximum(numpy.minimum(p1, p2), numpy.minimum(q1, q2))
+        high    = numpy.minimum(numpy.maximum(p1, p2), numpy.maximum(q1, q2))
+        """ Touching at a single point counts unless it ends both """
+        overlap = (low < high) | ((low == high) & ~shared)
+        flags   = numpy.where(collinear, overlap, flags)
+
+    if not parameters:
+        return flags
+    r, s  = P2 - P1, Q2 - Q1
+    start = Q1 - P1
+    with numpy.errstate(divide = 'ignore', invalid = 'ignore'):
+        denominator = _cross(r, s)
+        single      = flags & (denominator != 0)
+        t = numpy.where(single, _cross(start, s)/denominator, numpy.nan)
+        u = numpy.where(single, _cross(start, r)/denominator, numpy.nan)
+    points = P1 + t[..., None]*r
+    return flags, t, u, points
+
+
+def intersect_pairs(segmentsA, segmentsB, parameters = False):
+    """
+    Tests segmentsA[i] against segmentsB[i] for every i, both (k, 2, 2)
+    arrays (or sequences of segments), with the same rules as
+    lineintersection.segments_intersect.  Returns a boolean array of k
+    flags or, with parameters, (flags, t, u, points): the crossing is
+    at A[i][0] + t[i]*(A[i][1] - A[i][0]) and B[i][0] + u[i]*(...),
+    and points is (k, 2).  Pairs that don't meet in a single point
+    (collinear overlaps included) have NaN parameters and points.
+    """
+    A, B = as_segments(segmentsA), as_segments(segmentsB)
+    if len(A) != len(B):
+        raise ValueError('Segment arrays must have the same length')
+    return _kernel(A, B, parameters)
+
+
+def intersect_matrix(segmentsA, segmentsB, parameters = False,
+                     chunk_size = 1 << 20):
+    """
+    Tests every segment of segmentsA (N of them) against every one of
+    segmentsB (M), returning an (N, M) boolean array, or with
+    parameters (flags, t, u, points) shaped (N, M) and (N, M, 2), as
+    in intersect_pairs.  Rows are done in blocks of about chunk_size
+    pairs, so the temporaries stay that size however large N*M is.
+    """
+    A, B = as_segments(segmentsA), as_segments(segmentsB)
+    N, M = len(A), len(B)
+    rows = max(1, chunk_size // max(M, 1))
+
+    flags = numpy.zeros((N, M), dtype = bool)
+    if parameters:
+        t      = numpy.empty((N, M))
+        u      = numpy.empty((N, M))
+        points = numpy.empty((N, M, 2))
+    for start in xrange(0, N, rows):
+        block  = _kernel(A[start:start+rows, None], B[None], parameters)
+        window = slice(start, start + rows)
+        if parameters:
+            (flags[window], t[window],
+             u[window], points[window]) = block
+        else:
+            flags[window] = block
+    if parameters:
+        return flags, t, u, points
+    return flags
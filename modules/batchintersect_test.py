@@ -0,0 +1,67 @@
+"""
+This file contains test methods for batchintersect.py.
+"""
+
+import unittest
+import random
+
+import numpy
+
+import batchintersect
+import lineintersection
+
+
+
+class TestBatchIntersect(unittest.TestCase):
+
+    def random_segments(self, number, size = 5):
+        """ Small integer grid, so touching and collinear cases occur """
+        return [[(random.randint(0, size), random.randint(0, size)),
+                 (random.randint(0, size), random.randint(0, size))]
+                for i in xrange(number)]
+
+    def test_pairs_match_scalar(self):
+
+        A, B  = self.random_segments(2000), self.random_segments(2000)
+        flags = batchintersect.intersect_pairs(A, B)
+        self.assertEqual(flags.tolist(),
+                         [lineintersection.segments_intersect(a, b)
+                          for a, b in zip(A, B)])
+
+    def test_parameters(self):
+
+        A = [[(0,0),(4,4)], [(0,0),(2,0)], [(0,0),(1,0)]]
+        B = [[(0,4),(4,0)], [(1,0),(3,0)], [(2,1),(2,-1)]]
+        flags, t, u, points = batchintersect.intersect_pairs(A, B, True)
+        self.assertEqual(flags.tolist(), [True, True, False])
+        self.assertEqual((t[0], u[0]), (0.5, 0.5))
+        self.assertEqual(points[0].tolist(), [2.0, 2.0])
+        self.assertTrue(numpy.isnan(points[1:]).all())
+
+    def test_point_segments(self):
+
+        """ Collinear with no direction to order along """
+        A = [[(1,0),(1,0)], [(0,1),(0,1)], [(1,0),(1,0)], [(1,1),(1,1)]]
+        B = [[(1,2),(1,2)], [(2,1),(2,1)], [(1,-1),(1,3)], [(0,0),(2,2)]]
+        flags = batchintersect.intersect_pairs(A, B)
+        self.assertEqual(flags.tolist(), [False, False, True, True])
+        self.assertEqual(flags.tolist(),
+                         [lineintersection.segments_intersect(a, b)
+                          for a, b in zip(A, B)])
+
+    def test_matrix_chunks(self):
+
+        A, B  = self.random_segments(60), self.random_segments(45)
+        whole = batchintersect.intersect_matrix(A, B, True)
+        parts = batchintersect.intersect_matrix(A, B, True, chunk_size = 100)
+        for one, other in zip(whole, parts):
+            numpy.testing.assert_array_equal(one, other)
+        self.assertEqual(whole[0].tolist(),
+                         [[lineintersection.segments_intersect(a, b)
+                           for b in B] for a in A])
+        self.assertEqual(batchintersect.intersect_matrix([], B).shape, (0, 45))
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,239 @@
+"""
+Collection Module for Geometry Package
+
+Holds many polygons without building a SimplePolygon (and its
+vertices) for each one.
+"""
+from array import array
+
+import numpy
+
+import affine
+import polygon
+
+
+class PolygonCollection(object):
+    """
+    Struct-of-arrays store for many polygon rings.  All coordinates
+    live in one flat NumPy buffer [x0, y0, x1, y1, ...] and ring i is
+    made of vertices offsets[i] up to offsets[i+1] (a ragged layout),
+    so a million small polygons cost two arrays rather than millions
+    of objects.  The batch methods work on the whole buffer at once,
+    summing per ring with reduceat, and return one value per ring in
+    an ndarray.  Rings are kept in the order given and their
+    orientation is taken from their signed area, as in
+    SimplePolygon.from_buffer.  A SimplePolygon is only built when one
+    is asked for (see polygon).
+    """
+
+    def __init__(self, rings = ()):
+        """
+        Both buffers are allocated with room to spare, doubling when
+        full, so appending a ring costs time linear in its size.
+        coordinates and offsets are views of the part in use.
+        """
+        self._coordinates = numpy.empty(64)
+        self._offsets     = numpy.zeros(16, dtype = numpy.int64)
+        self._size        = 0
+        self._count       = 0
+        self.extend(rings)
+
+
+    @property
+    def coordinates(self):
+        return self._coordinates[:self._size]
+
+    @property
+    def offsets(self):
+        return self._offsets[:self._count+1]
+
+
+    @classmethod
+    def from_polygons(cls, polygons):
+        """ Collects the rings (in traversal order) of SimplePolygons """
+        return cls(list(pgon.ring()) for pgon in polygons)
+
+
+    def append(self, ring):
+        """
+        Adds a ring given as a flat buffer or a sequence of (x, y)
+        pairs.  There is no validation, as with VALIDATE_NONE, apart
+        from the vertice count.
+        """
+        flat = affine.as_points(ring).ravel()
+        if len(flat) < 6:
+            raise ValueError('Polygons require at least 3 vertices.')
+        size = self._size + len(flat)
+        if size > len(self._coordinates):
+            grown = numpy.empty(max(size, 2*len(self._coordinates)))
+            grown[:self._size] = self.coordinates
+            self._coordinates  = grown
+        if self._count + 2 > len(self._offsets):
+            self._offsets = numpy.concatenate(
+                                (self._offsets, numpy.zeros_like(self._offsets)))
+        self._coordinates[self._size:size] = flat
+        self._size                         = size
+        self._count                       += 1
+        self._offsets[self._count]         = size // 2
+
+
+    def extend(self, rings):
+        for ring in rings:
+            self.append(ring)
+
+
+    def __len__(self):
+        return self._count
+
+
+    def vertice_numbers(self):
+        return numpy.diff(self.offsets)
+
+
+    def ring(self, index):
+        """ Flat coordinate buffer of ring index (a copy, an array('d')) """
+        if not -len(self) <= index < len(self):
+            raise IndexError('Polygon index out of range')
+        index %= len(self)
+        return array('d', self.coordinates[2*self.offsets[index]:
+                                           2*self.offsets[index+1]].tobytes())
+
+
+    def polygon(self, index, storage = polygon.STORAGE_ARRAY):
+        """ Materializes ring index as a SimplePolygon """
+        return polygon.SimplePolygon.from_buffer(
+                   self.ring(index), polygon.VALIDATE_NONE, storage,
+                   copy = False)
+
+
+    def __getitem__(self, index):
+        return self.polygon(index)
+
+    def __iter__(self):
+        for index in xrange(len(self)):
+            yield self.polygon(index)
+
+    """
+    The following are batch versions of the SimplePolygon measures.
+    Each works out a term per edge (or vertice) over the whole buffer
+    in one go and reduces the terms ring by ring with reduceat,
+    returning an ndarray with one entry per ring.
+    """
+
+    def _vertices(self):
+        """
+        x, y of every vertice with the x, y of the vertice before it
+        in its ring, and the index each ring starts at.
+        """
+        points   = self.coordinates.reshape(-1, 2)
+        starts   = self.offsets[:-1]
+        previous = numpy.arange(-1, len(points) - 1)
+        previous[starts] = self.offsets[1:] - 1
+        return (points[:, 0], points[:, 1], points[previous, 0],
+                points[previous, 1], starts)
+
+
+    def _cross_terms(self):
+        x, y, px, py, starts = self._vertices()
+        return px*y - x*py, x, y, px, py, starts
+
+
+    def total_signed_area(self):
+        """ Shoelace formula per ring, see SimplePolygon.total_signed_area """
+        if not len(self):
+            return numpy.zeros(0)
+        cross, _, _, _, _, starts = self._cross_terms()
+        return 0.5*numpy.add.reduceat(cross, starts)
+
+
+    def total_area(self):
+        return numpy.abs(self.total_signed_area())
+
+
+    def centroid(self):
+        """
+        Centroids as a flat array [cx0, cy0, cx1, cy1, ...], see
+        SimplePolygon.centroid.
+        """
+        if not len(self):
+            return numpy.zeros(0)
+        cross, x, y, px, py, starts = self._cross_terms()
+        area3 = 3*numpy.add.reduceat(cross, starts)
+        return numpy.column_stack(
+                   (numpy.add.reduceat((px + x)*cross, starts)/area3,
+                    numpy.add.reduceat((py + y)*cross, starts)/area3)).ravel()
+
+
+    def get_perimeter(self):
+        if not len(self):
+            return numpy.zeros(0)
+        x, y, px, py, starts = self._vertices()
+        return numpy.add.reduceat(numpy.hypot(x - px, y - py), starts)
+
+
+    def bounding_boxes(self):
+        """ Flat array [min_x, min_y, max_x, max_y, ...], four per ring """
+        if not len(self):
+            return numpy.zeros(0)
+        points = self.coordinates.reshape(-1, 2)
+        starts = self.offsets[:-1]
+        return numpy.column_stack(
+                   (numpy.minimum.reduceat(points, starts),
+                    numpy.maximum.reduceat(points, starts))).ravel()
+
+
+    def polygon_is_convex(self):
+        """
+        1 for each convex ring, else 0.  As in
+        SimplePolygon.vertice_is_convex, a vertice is convex when its
+        turn has the same sign as the ring's area, so collinear
+        vertices count as concave.
+        """
+        if not len(self):
+            return numpy.zeros(0, dtype = numpy.int8)
+        x, y, px, py, starts = self._vertices()
+        following = numpy.arange(1, len(x) + 1)
+        following[self.offsets[1:] - 1] = starts
+        turns = (x - px)*(y[following] - py) - (y - py)*(x[following] - px)
+        signs = numpy.where(self.total_signed_area() > 0, 1, -1)
+        signs = numpy.repeat(signs, self.vertice_numbers())
+        return numpy.logical_and.reduceat(signs*turns > 0,
+                                          starts).astype(numpy.int8)
+
+
+    def adjacency_graph(self):
+        """
+        Which rings share an edge with which, as a CSR sparse graph:
+        the neighbours of ring i are indices[indptr[i]:indptr[i+1]], in
+        increasing order.  Every edge is hashed once by
+        polygon.edge_key, so the graph is built in time linear in the
+        number of edges.
+        """
+        coords, offsets = self.coordinates.tolist(), self.offsets.tolist()
+        owners = {}
+        for k in xrange(len(self)):
+            start, stop = 2*offsets[k], 2*offsets[k+1]
+            previous    = (coords[stop-2], coords[stop-1])
+            for i in xrange(start, stop, 2):
+                current = (coords[i], coords[i+1])
+                owners.setdefault(polygon.edge_key((previous, current)),
+                                  []).append(k)
+                previous = current
+
+        neighbours = [set() for _ in xrange(len(self))]
+        for rings in owners.itervalues():
+            if len(rings) > 1:
+                for ring in rings:
+                    neighbours[ring].update(rings)
+                    neighbours[ring].discard(ring)
+
+        indptr, indices = [0], []
+        for ring_neighbours in neighbours:
+            indices.extend(sorted(ring_neighbours))
+            indptr.append(len(indices))
+        return (numpy.array(indptr, dtype = numpy.int64),
+                numpy.array(indices, dtype = numpy.int64))
+
+
+    def __repr__(self):
+        return 'Collection of %s polygons' % len(self)
@@ -0,0 +1,81 @@
+"""
+This file contains test methods for collection.py.
+"""
+
+import unittest
+import random
+
+import polygon
+import collection
+
+
+
+class TestPolygonCollection(unittest.TestCase):
+
+    examples = [[(0,0),(0,1),(1,1),(1,0)], [(0,0),(1,0),(0,1)],
+                [(0,0),(0,2),(1,1),(2,2),(2,0)], [(0,0),(-1,0),(0,1)]]
+
+    def test_batch_matches_polygons(self):
+
+        polygons   = [polygon.SimplePolygon(list(example))
+                      for example in TestPolygonCollection.examples]
+        pgons      = collection.PolygonCollection(
+                         TestPolygonCollection.examples)
+        areas      = pgons.total_signed_area()
+        centroids  = pgons.centroid()
+        perimeters = pgons.get_perimeter()
+        convex     = pgons.polygon_is_convex()
+
+        self.assertEqual(len(pgons), len(polygons))
+        for i, pgon in enumerate(polygons):
+            self.assertAlmostEqual(areas[i], pgon.total_signed_area())
+            self.assertAlmostEqual(pgons.total_area()[i], pgon.total_area())
+            self.assertAlmostEqual(centroids[2*i], pgon.centroid()[0])
+            self.assertAlmostEqual(centroids[2*i+1], pgon.centroid()[1])
+            self.assertAlmostEqual(perimeters[i], pgon.get_perimeter())
+            self.assertEqual(bool(convex[i]), pgon.polygon_is_convex())
+
+    def test_batch_arrays(self):
+
+        pgons = collection.PolygonCollection(TestPolygonCollection.examples)
+        self.assertEqual(pgons.bounding_boxes().tolist(),
+                         [0,0,1,1, 0,0,1,1, 0,0,2,2, -1,0,0,1])
+        self.assertEqual(pgons.polygon_is_convex().tolist(), [1,1,0,1])
+        self.assertEqual(pgons.total_area().shape, (len(pgons),))
+        empty = collection.PolygonCollection()
+        self.assertEqual(len(empty.total_signed_area()), 0)
+        self.assertEqual(len(empty.polygon_is_convex()), 0)
+
+    def test_materialize(self, trials = 5):
+
+        for trial in xrange(trials):
+            rings = [[(random.random(), random.random()) for i in xrange(3)]
+                     for j in xrange(random.randint(1, 20))]
+            pgons = collection.PolygonCollection(rings)
+            index = random.randrange(len(rings))
+            self.assertEqual(list(pgons[index].ring()), rings[index])
+            self.assertEqual(pgons.vertice_numbers().tolist(),
+                             [3]*len(rings))
+        self.assertRaises(IndexError, pgons.polygon, len(rings))
+        self.assertRaises(ValueError, pgons.append, [(0,0),(1,1)])
+
+    def test_adjacency_graph(self):
+
+        """ A 3x3 grid of unit squares, numbered row by row """
+        squares = [[(x,y),(x,y+1),(x+1,y+1),(x+1,y)]
+                   for y in xrange(3) for x in xrange(3)]
+        pgons   = collection.PolygonCollection(squares)
+        indptr, indices = pgons.adjacency_graph()
+
+        self.assertEqual(indptr.tolist(), [0, 2, 5, 7, 10, 14, 17, 19, 22, 24])
+        self.assertEqual(indices[indptr[4]:indptr[5]].tolist(), [1, 3, 5, 7])
+        self.assertEqual(indices[indptr[0]:indptr[1]].tolist(), [1, 3])
+
+        polygons = list(pgons)
+        for i in xrange(len(polygons)):
+            for j in xrange(len(polygons)):
+                self.assertEqual(polygons[i].share_edge(polygons[j]) and i != j,
+                                 j in indices[indptr[i]:indptr[i+1]])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,6 +4,179 @@ Line Intersection Module for Geometry Package
 Things to do:
 add unit tests
 """
+import heapq
+import itertools
+import math
+from fractions import Fraction
+
+import sweepstatus
+import segmentgrid
+
+
+""" Engines for LineIntersection """
+ENGINE_AUTO  = 'auto'
+ENGINE_SWEEP = 'sweep'
+ENGINE_GRID  = 'grid'
+
+"""
+ENGINE_AUTO uses the grid for at least GRID_MIN_LINES lines whose
+grid cells hold no more than GRID_PAIRS_PER_STEP candidate pairs per
+line and per log2 of the number of lines (the sweep takes about
+log2 n steps per line), and the sweep otherwise.
+"""
+GRID_MIN_LINES      = 64
+GRID_PAIRS_PER_STEP = 8
+
+
+def orientation(p, q, r):
+    """
+    Sign of the cross product of q - p and r - p: 1 if p, q, r make
+    a left (counter-clockwise) turn, -1 for a right turn and 0 if the
+    three are collinear.
+    """
+    cross = (q[0] - p[0])*(r[1] - p[1]) - (q[1] - p[1])*(r[0] - p[0])
+    return (cross > 0) - (cross < 0)
+
+
+def float_orientation(p, q, r):
+    """
+    orientation in floating point, or None when the cross product is
+    too small, relative to the coordinates, for its sign to be trusted
+    (allowing for the points themselves having been rounded).  A cheap
+    filter in front of exact arithmetic.
+    """
+    cross = (q[0] - p[0])*(r[1] - p[1]) - (q[1] - p[1])*(r[0] - p[0])
+    scale = ((abs(p[0]) + abs(p[1]) + abs(q[0]) + abs(q[1]) +
+              abs(r[0]) + abs(r[1]))*
+             (abs(q[0] - p[0]) + abs(q[1] - p[1]) +
+              abs(r[0] - p[0]) + abs(r[1] - p[1])))
+    if abs(cross) > 1e-12*scale:
+        return 1 if cross > 0 else -1
+    return None
+
+
+def segments_intersect(lineA, lineB):
+    """
+    True if the closed segments lineA and lineB have a point in common
+    other than an endpoint of both.  So crossings, an endpoint touching
+    the other segment (a T-junction) and collinear overlaps all count,
+    while two segments that only meet at a shared endpoint, as
+    neighbouring polygon edges do, don't.
+    """
+    P1, P2 = lineA[0], lineA[1]
+    Q1, Q2 = lineB[0], lineB[1]
+    o1, o2 = orientation(P1, P2, Q1), orientation(P1, P2, Q2)
+    o3, o4 = orientation(Q1, Q2, P1), orientation(Q1, Q2, P2)
+
+    if o1 == o2 == o3 == o4 == 0:
+        """
+        Collinear: along a line, lexicographic order of points is order
+        along the line, so the overlap is [max of lows, min of highs].
+        """
+        A_low, A_high = min(P1, P2), max(P1, P2)
+        B_low, B_high = min(Q1, Q2), max(Q1, Q2)
+        low, high     = max(A_low, B_low), min(A_high, B_high)
+        if low > high:
+            return False
+        if low < high:
+            return True
+        return not (low in (P1, P2) and low in (Q1, Q2))
+
+    if o1 != o2 and o3 != o4:
+        """
+        The segments meet at exactly one point, and if they share an
+        endpoint that point is it.
+        """
+        return not (P1 == Q1 or P1 == Q2 or P2 == Q1 or P2 == Q2)
+    return False
+
+
+def compare_at_start(segmentS, segmentT):
+    """
+    Sweep order of segment S against segment T, taken at the left end
+    of S, where S enters the sweep.  Segments are (left, right) pairs
+    of endpoints, sorted.  Returns 1 if S is above T there, -1 if below,
+    and 0 if they are collinear from that point on.  When the left end
+    of S lies on T, the segment turning upwards more steeply is taken to
+    be above, and a vertical segment is above all others.
+    """
+    P, S_right      = segmentS
+    T_left, T_right = segmentT
+    if T_left[0] == T_right[0]:
+        """ Vertical T, the sweep sits on it somewhere along its length """
+        side = 0 if T_left[1] <= P[1] <= T_right[1] else (
+               1 if P[1] > T_right[1] else -1)
+    else:
+        side = orientation(T_left, T_right, P)
+    if side:
+        return side
+    return orientation(P, T_right, S_right)
+
+
+def exact_segment(line):
+    """
+    (left, right) endpoints of line as exact Fractions, sorted as in
+    LineIntersection.endpoints.  Floats convert without rounding.
+    """
+    first  = (Fraction(line[0][0]), Fraction(line[0][1]))
+    second = (Fraction(line[1][0]), Fraction(line[1][1]))
+    return (first, second) if first <= second else (second, first)
+
+
+def crossing_point(segmentA, segmentB):
+    """
+    The single point two segments of Fractions (see exact_segment)
+    have in common, or None if they are parallel or don't meet.  The
+    point is exact, so it compares equal to an endpoint it lands on.
+    """
+    (ax, ay), (bx, by) = segmentA
+    (cx, cy), (dx, dy) = segmentB
+    rx, ry = bx - ax, by - ay
+    sx, sy = dx - cx, dy - cy
+    denominator = rx*sy - ry*sx
+    if denominator == 0:
+        return None
+    t = ((cx - ax)*sy - (cy - ay)*sx)/denominator
+    u = ((cx - ax)*ry - (cy - ay)*rx)/denominator
+    if not (0 <= t <= 1 and 0 <= u <= 1):
+        return None
+    return (ax + t*rx, ay + t*ry)
+
+
+def meeting_point(lineA, lineB):
+    """
+    The point at which all_intersections reports two intersecting
+    lines, as exact Fractions: where they cross, or where their
+    collinear overlap begins (the lesser point, smaller in x, then y).
+    """
+    A, B  = exact_segment(lineA), exact_segment(lineB)
+    point = crossing_point(A, B)
+    return point if point is not None else max(A[0], B[0])
+
+
+def intersection_point(lineA, lineB):
+    """
+    Where lineA and lineB meet, as an (x, y) pair of floats, or None
+    if they don't meet in a single point (including collinear overlaps).
+    """
+    point = crossing_point(exact_segment(lineA), exact_segment(lineB))
+    if point is None:
+        return None
+    return (float(point[0]), float(point[1]))
+
+
+def red_blue_intersections(redLines, blueLines, engine = ENGINE_AUTO):
+    """
+    Yields (redLine, blueLine, point) for every intersection between a
+    line of redLines and a line of blueLines, as in all_intersections,
+    ignoring intersections within either set.
+    """
+    red = list(redLines)
+    LI  = LineIntersection(red)
+    LI.add_lines(blueLines)
+    return LI.red_blue_intersections([str(i) for i in xrange(len(red))],
+                                     engine)
+
 
 class LineIntersection(object):
     """
@@ -21,19 +194,24 @@ class LineIntersection(object):
         self.lines      = {}
         self.sweeps     = []
         self.tested     = []
+        self.intersecting_pair = None
+        self.engine     = None
+        self._grid      = None
         self.add_lines(lines)
 
 
-    def add_line(self, line):
+    def add_line(self, line, label = None):
         """
         Breaks line into endpoints, labels according to
-        current self.count value, adds to dictionary and
-        raises count by 1.
+        current self.count value (unless given a label),
+        adds to dictionary and raises count by 1.
         """
-        self.sweeps.append([line[0], str(self.count)])
-        self.sweeps.append([line[1], str(self.count)])
-        self.lines[str(self.count)] = line
+        label = str(self.count) if label is None else label
+        self.sweeps.append([line[0], label])
+        self.sweeps.append([line[1], label])
+        self.lines[label] = line
         self.count += 1
+        self._grid  = None
 
 
     def add_lines(self, lines):
@@ -41,6 +219,15 @@ class LineIntersection(object):
             self.add_line(line)
 
 
+    def endpoints(self, label):
+        """
+        (left, right) endpoints of a line as tuples, left being the
+        smaller in x, then in y.
+        """
+        first, second = tuple(self.lines[label][0]), tuple(self.lines[label][1])
+        return (first, second) if first <= second else (second, first)
+
+
     def sort_sweeps(self):
         self.sweeps.sort(key = lambda x: (x[0][0], not x[1]))
 
@@ -65,45 +252,521 @@ class LineIntersection(object):
         return True if xproductP*xproductQ < 0 else False
 
 
-    def general_intersection(self):
+    def general_intersection(self, engine = ENGINE_AUTO):
+        """
+        True if any two lines intersect, found by the sweep or the grid
+        (see select_engine).  The engine used is kept in self.engine and
+        the pair of line labels found in self.intersecting_pair.
+        """
+        self.engine = self.select_engine() if engine == ENGINE_AUTO else engine
+        if self.engine == ENGINE_GRID:
+            return self.grid_intersection()
+        if self.engine == ENGINE_SWEEP:
+            return self.sweep_intersection()
+        raise ValueError('Unknown engine %r' % (engine,))
+
+
+    def sweep_intersection(self):
         """ The following is the implementation of a sweep-line algorithm """
         """
-        Sorting the endpoints of each line(sweeps), we iterate through them
-        from left to right, adding them to events as they come up.  If the
-        other endpoint of the line comes up, both are removed.  If any endpoints
-        of other lines come up while an endpoint is an event, these two lines
-        need to be tested for intersection.
+        Shamos-Hoey: sweeping endpoints from left to right, bottom to
+        top when x ties and leaving before joining at a shared point,
+        lines join a balanced sweep status (see
+        sweepstatus.SweepStatus) when the sweep reaches their left end
+        and leave at their right end.  If any two lines intersect, the
+        leftmost intersection is found by testing only lines that
+        become neighbours in the status: a joining line against the
+        lines just above and below it, and those two against each other
+        when the line between them leaves.  O(n log n) for n lines.
+
+        Lines meeting only at a shared endpoint don't count, crossings,
+        T-junctions and collinear overlaps do (see segments_intersect).
+        The pair of line labels found is kept in self.intersecting_pair.
         """
+        self.intersecting_pair = None
 
         """ Empty case """
-        if not self.sweeps:
+        if not self.lines:
             return False
 
-        """ Sorting the sweeps, initializing events."""
-        self.sort_sweeps()
-        events = []
+        segments = dict((label, self.endpoints(label)) for label in self.lines)
+        events   = []
+        for label, (left, right) in segments.iteritems():
+            events.append((left, 1, label))
+            if left != right:
+                events.append((right, 0, label))
+        events.sort()
+
+        compare = lambda s, t: (compare_at_start(segments[s], segments[t]) or
+                                cmp(s, t))
+        status  = sweepstatus.SweepStatus()
+        nodes   = {}
 
         """ Beginning sweep """
-        i = 0
-        while i < len(self.sweeps):
-            """ Getting new endpoint's dictionary key """
-            line_name = self.sweeps[i][1]
-            if not events:
-                events.append(line_name)
-            elif line_name in events:
-                events.remove(line_name)
-                # New endpoint arrives while another is active:
-            else:
-                for event in events:
-                    """ Grabs data for calculation from dictionary using keys """
-                    test_results = self.intersecting_two(self.lines[event],
-                                                     self.lines[line_name])
-                    if test_results:
+        for point, joining, label in events:
+            if joining:
+                node = status.insert(label, compare)
+                for neighbour in (status.predecessor(node),
+                                  status.successor(node)):
+                    if neighbour is not None and self._report(label,
+                                                              neighbour.item):
                         return True
-            i += 1
+                if segments[label][0] != segments[label][1]:
+                    nodes[label] = node
+                    continue
+                """ A single point leaves as soon as it has joined """
+            else:
+                node = nodes.pop(label)
+            below, above = status.predecessor(node), status.successor(node)
+            status.remove(node)
+            if (below is not None and above is not None and
+                    self._report(below.item, above.item)):
+                return True
+
+        return False
+
 
+    def _report(self, labelA, labelB):
+        """ Tests two lines, remembering them if they intersect """
+        if segments_intersect(self.lines[labelA], self.lines[labelB]):
+            self.intersecting_pair = (labelA, labelB)
+            return True
         return False
 
 
+    def grid_intersection(self):
+        """
+        Broad phase on a uniform grid (see grid): only lines sharing a
+        cell can intersect, so only those pairs are tested.  About
+        linear time for lines spread evenly at a similar scale.
+        """
+        self.intersecting_pair = None
+        for labelA, labelB in self.candidate_pairs():
+            if self._report(labelA, labelB):
+                return True
+        return False
+
+    """ The following choose between the sweep and the grid. """
+
+    def grid(self):
+        """
+        SegmentGrid of the lines under their labels, cells sized from
+        the mean line length (see SegmentGrid.cell_size_for).  Kept
+        until lines are added.
+        """
+        if self._grid is None:
+            self._grid = segmentgrid.SegmentGrid(
+                segmentgrid.SegmentGrid.cell_size_for(self.lines.values()))
+            for label, line in self.lines.iteritems():
+                self._grid.insert(label, line)
+        return self._grid
+
+
+    def candidate_pairs(self):
+        """ Each pair of labels of lines sharing a grid cell, once """
+        grid = self.grid()
+        for label, line in self.lines.iteritems():
+            for other in grid.candidates(line):
+                if label < other:
+                    yield label, other
+
+
+    def select_engine(self):
+        """
+        ENGINE_GRID or ENGINE_SWEEP for the lines held.  Few lines go to
+        the sweep.  Otherwise the grid is built and the candidate pairs
+        it would test are counted from its cell occupancy: evenly spread
+        lines give a few per line and go to the grid, while clustered
+        lines, or long ones among short ones, crowd cells and go to the
+        sweep, whose cost grows with the intersections found rather
+        than with the lines merely lying close.
+        """
+        number = len(self.lines)
+        if number < GRID_MIN_LINES:
+            return ENGINE_SWEEP
+        budget = GRID_PAIRS_PER_STEP*number*math.log(number, 2)
+        pairs  = 0
+        for bucket in self.grid().cells.itervalues():
+            pairs += len(bucket)*(len(bucket) - 1)//2
+            if pairs > budget:
+                return ENGINE_SWEEP
+        return ENGINE_GRID
+
+    """ The following report where lines intersect. """
+
+    def all_intersections(self, engine = ENGINE_AUTO):
+        """
+        Yields (lineA, lineB, point) for every pair of intersecting
+        lines, from the sweep or the grid (see select_engine), with
+        the engine used kept in self.engine.  The sweep reports in
+        sweep order, the grid in no particular order; both report
+        a pair at the same point (see meeting_point).
+        """
+        self.engine = self.select_engine() if engine == ENGINE_AUTO else engine
+        if self.engine == ENGINE_GRID:
+            return self.grid_intersections()
+        if self.engine == ENGINE_SWEEP:
+            return self.sweep_intersections()
+        raise ValueError('Unknown engine %r' % (engine,))
+
+
+    def grid_intersections(self):
+        """ Generator as all_intersections, testing grid candidates only """
+        for labelA, labelB, point in self.grid_pairs():
+            yield self.lines[labelA], self.lines[labelB], point
+
+
+    def grid_pairs(self, pairs = None):
+        """
+        As grid_intersections, yielding line labels rather than lines.
+        Only pairs passing through pairs (the candidate_pairs, or some
+        of them) are tested.
+        """
+        for labelA, labelB in (self.candidate_pairs() if pairs is None
+                               else pairs):
+            lineA, lineB = self.lines[labelA], self.lines[labelB]
+            if segments_intersect(lineA, lineB):
+                point = meeting_point(lineA, lineB)
+                yield labelA, labelB, (float(point[0]), float(point[1]))
+
+
+    def sweep_intersections(self):
+        """ Generator as all_intersections, see sweep_pairs """
+        for labelA, labelB, point in self.sweep_pairs():
+            yield self.lines[labelA], self.lines[labelB], point
+
+
+    def sweep_pairs(self):
+        """
+        Bentley-Ottmann: yields (labelA, labelB, point) for every pair
+        of lines that intersect, as the sweep reaches the point, where
+        point is an (x, y) pair of floats.  Takes O((n + k) log n) for
+        n lines and k intersections, and holds only the sweep status
+        and the pending events, never the intersections found.
+
+        Events are the endpoints and the crossings found between lines
+        that become neighbours in the sweep status, kept in a heap
+        ordered left to right, then bottom to top.  At each event the lines through it
+        are found in the status (they are adjacent there), reported,
+        and put back in their order just past the event, which reverses
+        the ones crossing there.  Crossings are exact Fractions, so
+        three or more lines through one point are handled together; the
+        arithmetic is done in floating point first and only redone
+        exactly when it is too close to call.
+
+        Pairs follow segments_intersect: lines only sharing an endpoint
+        are not reported, T-junctions are, and collinear lines that
+        overlap are reported once, where the overlap begins.
+        """
+        segments = dict((label, self.endpoints(label)) for label in self.lines)
+        floats   = {}
+        slopes   = {}
+        starting = {}
+        for label, (left, right) in segments.iteritems():
+            floats[label] = ((float(left[0]), float(left[1])),
+                             (float(right[0]), float(right[1])))
+            starting.setdefault(left, []).append(label)
+            starting.setdefault(right, [])
+        """
+        Rounding is monotone, so ordering by the rounded point first
+        never contradicts the exact order, and is much cheaper.
+        """
+        queue = [(float(x), float(y), (x, y)) for x, y in starting]
+        heapq.heapify(queue)
+
+        status = sweepstatus.SweepStatus()
+        nodes  = {}
+        sweep  = [None, None]
+        close  = {}
+
+        def exact(point):
+            return (Fraction(point[0]), Fraction(point[1]))
+
+        def steepness(label):
+            """ Sort key for slopes, vertical being the steepest """
+            if label not in slopes:
+                (lx, ly), (rx, ry) = exact(segments[label][0]), exact(segments[label][1])
+                slopes[label] = (1, 0) if lx == rx else (0, (ry - ly)/(rx - lx))
+            return slopes[label]
+
+        def side(label):
+            """
+            1 if the sweep point is above line, -1 if below, 0 if on it.
+            Decided in floating point when the result is clear by a wide
+            margin (including the rounding of the point itself), and
+            exactly otherwise (and remembered, as the same lines are
+            asked about repeatedly at an event).
+            """
+            (lx, ly), (rx, ry) = segments[label]
+            if lx != rx:
+                position = float_orientation(floats[label][0],
+                                             floats[label][1], sweep[1])
+                if position is not None:
+                    return position
+                if sweep[0] in segments[label]:
+                    return 0
+                if label not in close:
+                    close[label] = orientation(exact((lx, ly)), exact((rx, ry)),
+                                               exact(sweep[0]))
+                return close[label]
+            y = sweep[0][1]
+            return 0 if ly <= y <= ry else (1 if y > ry else -1)
+
+        def compare(label, other):
+            """ Order just past the sweep point, for lines through it """
+            return (side(other) or
+                    cmp(steepness(label), steepness(other)) or
+                    cmp(label, other))
+
+        def through_sweep():
+            """ Nodes of the lines through the sweep point, bottom to top """
+            node = status.root
+            while node is not None:
+                position = side(node.item)
+                if not position:
+                    break
+                node = node.right if position > 0 else node.left
+            if node is None:
+                return []
+            run   = [node]
+            below = status.predecessor(node)
+            while below is not None and not side(below.item):
+                run.insert(0, below)
+                below = status.predecessor(below)
+            above = status.successor(node)
+            while above is not None and not side(above.item):
+                run.append(above)
+                above = status.successor(above)
+            return run
+
+        def reported_here(labelA, labelB):
+            """
+            Whether two lines through the sweep point are reported there:
+            overlapping collinear lines once, where the overlap starts,
+            other lines unless the point is an endpoint of both.
+            """
+            (A_left, A_right), (B_left, B_right) = segments[labelA], segments[labelB]
+            start = max(A_left, B_left)
+            if (steepness(labelA) == steepness(labelB) and
+                    A_left != A_right and B_left != B_right and
+                    start < min(A_right, B_right)):
+                return start == sweep[0]
+            return not (sweep[0] in segments[labelA] and
+                        sweep[0] in segments[labelB])
+
+        def schedule(labelA, labelB):
+            """ Queues the crossing of two lines, if it is still ahead """
+            (P1, P2), (Q1, Q2) = floats[labelA], floats[labelB]
+            """ Lines wholly to one side of each other can't cross """
+            for line, ends in (((P1, P2), (Q1, Q2)), ((Q1, Q2), (P1, P2))):
+                first = float_orientation(line[0], line[1], ends[0])
+                if first and first == float_orientation(line[0], line[1],
+                                                        ends[1]):
+                    return
+            crossing = crossing_point(map(exact, segments[labelA]),
+                                      map(exact, segments[labelB]))
+            if (crossing is not None and crossing > sweep[0] and
+                    crossing not in starting):
+                starting[crossing] = []
+                heapq.heappush(queue, (float(crossing[0]), float(crossing[1]),
+                                       crossing))
+
+        """ Beginning sweep """
+        while queue:
+            x, y, point = heapq.heappop(queue)
+            location    = (x, y)
+            sweep[:]    = point, location
+            close.clear()
+            joining     = starting.pop(point)
+            run         = through_sweep()
+            singles     = [label for label in joining
+                           if segments[label][0] == segments[label][1]]
+            joining     = [label for label in joining if label not in singles]
+            passing     = [node.item for node in run
+                           if segments[node.item][1] != point]
+
+            involved = sorted(joining + singles + [node.item for node in run])
+            for labelA, labelB in itertools.combinations(involved, 2):
+                if reported_here(labelA, labelB):
+                    yield labelA, labelB, location
+
+            below = status.predecessor(run[0]) if run else None
+            above = status.successor(run[-1]) if run else None
+            for node in run:
+                status.remove(node)
+                del nodes[node.item]
+            for label in joining + passing:
+                nodes[label] = status.insert(label, compare)
+
+            if not joining and not passing:
+                if below is not None and above is not None:
+                    schedule(below.item, above.item)
+                continue
+            inserted = set(joining + passing)
+            lowest   = highest = nodes[joining[0] if joining else passing[0]]
+            while status.predecessor(lowest) is not None and (
+                    status.predecessor(lowest).item in inserted):
+                lowest = status.predecessor(lowest)
+            while status.successor(highest) is not None and (
+                    status.successor(highest).item in inserted):
+                highest = status.successor(highest)
+            if status.predecessor(lowest) is not None:
+                schedule(status.predecessor(lowest).item, lowest.item)
+            if status.successor(highest) is not None:
+                schedule(highest.item, status.successor(highest).item)
+
+
+    def red_blue_intersections(self, red, engine = ENGINE_AUTO):
+        """
+        Yields (redLine, blueLine, point) for every intersection between
+        a line whose label is in red and one whose label isn't, and no
+        others.  The grid only tests such mixed pairs.  The sweep runs
+        over all the lines and drops the rest, which costs little when
+        lines of one colour don't cross each other, as with the edges of
+        two simple polygons.
+        """
+        red = set(red)
+        self.engine = self.select_engine() if engine == ENGINE_AUTO else engine
+        if self.engine == ENGINE_GRID:
+            found = self.grid_pairs((labelA, labelB) for labelA, labelB
+                                    in self.candidate_pairs()
+                                    if (labelA in red) != (labelB in red))
+        elif self.engine == ENGINE_SWEEP:
+            found = self.sweep_pairs()
+        else:
+            raise ValueError('Unknown engine %r' % (engine,))
+        for labelA, labelB, point in found:
+            if labelB in red and labelA not in red:
+                labelA, labelB = labelB, labelA
+            if labelA in red and labelB not in red:
+                yield self.lines[labelA], self.lines[labelB], point
+
+
     def __repr__(self):
         return 'Class for General Line Intersection in the plane'
+
+
+def _length(line):
+    return math.hypot(line[1][0] - line[0][0], line[1][1] - line[0][1])
+
+
+class DynamicLineIntersection(LineIntersection):
+    """
+    LineIntersection for lines arriving and leaving one at a time, as
+    in an editor, that keeps them indexed in a SegmentGrid as they
+    come rather than rebuilding anything.  Adding or removing a line
+    touches only the cells it covers, and asking which lines a line
+    crosses tests only the lines sharing those cells, so each is O(k)
+    for a line covering k cells among lines of similar length.  The
+    whole-set methods (general_intersection, all_intersections) still
+    work, and the grid engine uses the maintained index.
+
+    The cell size is cell_size if given, and stays fixed.  Otherwise
+    it is the mean length of the lines (see
+    SegmentGrid.cell_size_for), and follows it: once the mean has
+    drifted from the cell size by more than a factor of four, and at
+    least half as many lines have come or gone as are indexed, the
+    grid is rebuilt at the new mean.  Each rebuild is paid for by the
+    edits since the last one, so the cost stays amortized O(k) per
+    edit, while a tiny first line no longer leaves a long one to cover
+    a huge number of cells (or a long first line every line in a
+    single cell).
+    """
+
+    """ Drift of the mean length from the cell size that triggers a rebuild """
+    drift = 4.0
+
+    def __init__(self, lines = (), cell_size = None):
+
+        lines      = list(lines)
+        self.index = None
+        """ Total length of the lines, and edits since the grid was built """
+        self._length  = 0.0
+        self._changes = 0
+        if cell_size is not None or lines:
+            self.index = segmentgrid.SegmentGrid(
+                cell_size or segmentgrid.SegmentGrid.cell_size_for(lines))
+        """ The first lines are already accounted for in the cell size """
+        self.fixed_cell_size = True
+        LineIntersection.__init__(self, lines)
+        self.fixed_cell_size = cell_size is not None
+        self._changes        = 0
+
+
+    def add_line(self, line, label = None):
+        """ Indexes line, returning its label """
+        label = str(self.count) if label is None else label
+        if label in self.lines:
+            raise ValueError('Label %r is already in use' % (label,))
+        length = _length(line)
+        if self.index is None:
+            self.index = segmentgrid.SegmentGrid(
+                segmentgrid.SegmentGrid.cell_size_for([line]))
+        else:
+            """ Resized before inserting, so line is cut at the new size """
+            self._resize(self._length + length, len(self.lines) + 1)
+        self.lines[label] = line
+        self.index.insert(label, line)
+        self._length  += length
+        self._changes += 1
+        self.count    += 1
+        return label
+
+
+    def remove_line(self, label):
+        """ Drops the line with label from the index, returning it """
+        self.index.remove(label)
+        line = self.lines.pop(label)
+        self._length  -= _length(line)
+        self._changes += 1
+        self._resize(self._length, len(self.lines))
+        return line
+
+
+    def _resize(self, total, number):
+        """
+        Rebuilds the grid at the mean length total/number of number
+        lines if it has drifted too far from the cell size, see above.
+        """
+        if self.fixed_cell_size or 2*self._changes < len(self.lines):
+            return
+        mean = 1.0*total/number if number and total > 0 else 1.0
+        cell = self.index.cell_size
+        if cell/self.drift <= mean <= cell*self.drift:
+            return
+        self.index = segmentgrid.SegmentGrid(mean)
+        for label, line in self.lines.iteritems():
+            self.index.insert(label, line)
+        self._changes = 0
+
+
+    def grid(self):
+        if self.index is None:
+            return LineIntersection.grid(self)
+        return self.index
+
+
+    def crossings(self, line, ignore = None):
+        """
+        Labels of the indexed lines that intersect line (as in
+        segments_intersect), leaving out the label ignore, so that
+        crossings(self.lines[label], label) checks an indexed line.
+        """
+        if self.index is None:
+            return []
+        return [label for label in self.index.candidates(line)
+                if label != ignore and
+                segments_intersect(line, self.lines[label])]
+
+
+    def crosses_any(self, line, ignore = None):
+        """ As crossings, stopping at the first line found """
+        if self.index is None:
+            return False
+        return any(label != ignore and
+                   segments_intersect(line, self.lines[label])
+                   for label in self.index.candidates(line))
+
+
+    def __repr__(self):
+        return 'Dynamic Line Intersection of %s lines' % len(self.lines)
@@ -0,0 +1,224 @@
+"""
+This file contains test methods for lineintersection.py.
+"""
+
+import unittest
+import random
+import itertools
+
+import lineintersection
+import sweepstatus
+
+
+
+class TestLineIntersection(unittest.TestCase):
+
+    def test_segments_intersect(self):
+
+        fn = lineintersection.segments_intersect
+        self.assertTrue(fn([(0,0),(2,2)], [(0,2),(2,0)]))
+        """ T-junction and collinear overlap """
+        self.assertTrue(fn([(0,0),(2,0)], [(1,0),(1,3)]))
+        self.assertTrue(fn([(0,0),(2,0)], [(1,0),(3,0)]))
+        """ A shared endpoint alone is not an intersection """
+        self.assertFalse(fn([(0,0),(2,0)], [(2,0),(3,5)]))
+        self.assertFalse(fn([(0,0),(2,0)], [(0,1),(2,1)]))
+        self.assertFalse(fn([(0,0),(1,1)], [(2,2),(3,3)]))
+
+    def brute_force(self, lines):
+        return any(lineintersection.segments_intersect(a, b)
+                   for a, b in itertools.combinations(lines, 2))
+
+    def test_general_intersection(self):
+
+        cases = [([[(0,0),(4,4)], [(0,4),(4,0)]], True),
+                 ([[(0,0),(4,0)], [(2,-1),(2,3)]], True),
+                 ([[(0,0),(4,0)], [(2,0),(2,3)]], True),
+                 ([[(0,0),(4,0)], [(1,0),(6,0)]], True),
+                 ([[(0,0),(4,0)], [(4,0),(4,4)], [(4,4),(0,0)]], False),
+                 ([[(0,0),(0,4)], [(0,2),(0,6)]], True),
+                 ([[(0,0),(0,4)], [(1,0),(1,4)], [(-1,2),(3,2)]], True),
+                 ([[(0,0),(4,0)], [(1,1),(3,1)], [(0,2),(4,-2)]], True),
+                 ([[(0,0),(4,0)], [(2,0),(2,0)]], True),
+                 ([[(0,0),(4,0)], [(2,1),(2,1)]], False),
+                 ([], False)]
+        for lines, expected in cases:
+            LI = lineintersection.LineIntersection(lines)
+            self.assertEqual(LI.general_intersection(), expected)
+            if expected:
+                first, second = LI.intersecting_pair
+                self.assertTrue(lineintersection.segments_intersect(
+                                    LI.lines[first], LI.lines[second]))
+            else:
+                self.assertEqual(LI.intersecting_pair, None)
+
+    def test_against_brute_force(self, trials = 300):
+
+        for trial in xrange(trials):
+            """ Small integer grid, so touching and collinear cases occur """
+            number = random.randint(2, 8)
+            lines  = [[(random.randint(0, 5), random.randint(0, 5)),
+                       (random.randint(0, 5), random.randint(0, 5))]
+                      for i in xrange(number)]
+            LI = lineintersection.LineIntersection(lines)
+            self.assertEqual(LI.general_intersection(),
+                             self.brute_force(lines), lines)
+
+    def test_intersection_point(self):
+
+        fn = lineintersection.intersection_point
+        self.assertEqual(fn([(0,0),(2,2)], [(0,2),(2,0)]), (1.0, 1.0))
+        self.assertEqual(fn([(0,0),(1,3)], [(0,1),(1,0)]), (0.25, 0.75))
+        self.assertEqual(fn([(0,0),(2,0)], [(1,0),(3,0)]), None)
+        self.assertEqual(fn([(0,0),(1,0)], [(2,1),(2,-1)]), None)
+
+    def test_all_intersections(self):
+
+        """ Five lines through (2,2), a vertical and two collinear ones """
+        lines = [[(0,0),(4,4)], [(0,4),(4,0)], [(2,0),(2,5)], [(0,2),(2,2)],
+                 [(1,2),(3,2)], [(5,5),(6,6)]]
+        LI    = lineintersection.LineIntersection(lines)
+        found = list(LI.all_intersections())
+        self.assertEqual(len(found), 10)
+        for lineA, lineB, point in found:
+            if lineA is lines[3] and lineB is lines[4]:
+                self.assertEqual(point, (1.0, 2.0))
+            else:
+                self.assertEqual(point, (2.0, 2.0))
+
+    def test_all_against_brute_force(self, trials = 100):
+
+        for trial in xrange(trials):
+            number = random.randint(2, 8)
+            lines  = [[(random.randint(0, 5), random.randint(0, 5)),
+                       (random.randint(0, 5), random.randint(0, 5))]
+                      for i in xrange(number)]
+            index  = dict((id(line), i) for i, line in enumerate(lines))
+            found  = [sorted((index[id(lineA)], index[id(lineB)]))
+                      for lineA, lineB, point in
+                      lineintersection.LineIntersection(lines).all_intersections()]
+            expected = [[i, j] for i, j in
+                        itertools.combinations(xrange(number), 2)
+                        if lineintersection.segments_intersect(lines[i], lines[j])]
+            self.assertEqual(sorted(found), expected, lines)
+
+    def test_grid_engine(self, trials = 30):
+
+        for trial in xrange(trials):
+            lines = [[(random.randint(0, 9), random.randint(0, 9)),
+                      (random.randint(0, 9), random.randint(0, 9))]
+                     for i in xrange(random.randint(2, 12))]
+            index = dict((id(line), i) for i, line in enumerate(lines))
+            found = {}
+            for engine in (lineintersection.ENGINE_SWEEP,
+                           lineintersection.ENGINE_GRID):
+                LI = lineintersection.LineIntersection(lines)
+                found[engine] = sorted(
+                    (sorted((index[id(lineA)], index[id(lineB)])), point)
+                    for lineA, lineB, point in LI.all_intersections(engine))
+                self.assertEqual(LI.engine, engine)
+                self.assertEqual(LI.general_intersection(engine),
+                                 bool(found[engine]))
+            self.assertEqual(found[lineintersection.ENGINE_SWEEP],
+                             found[lineintersection.ENGINE_GRID])
+
+    def test_select_engine(self):
+
+        """ Short lines spread over a wide area, then crowded together """
+        lines = []
+        for i in xrange(400):
+            x, y = random.uniform(0, 200), random.uniform(0, 200)
+            lines.append([(x,y), (x + random.uniform(-2,2), y + random.uniform(-2,2))])
+        LI = lineintersection.LineIntersection(lines)
+        LI.general_intersection()
+        self.assertEqual(LI.engine, lineintersection.ENGINE_GRID)
+        crowded = [[(x/50, y/50), (x/50 + bx - x, y/50 + by - y)]
+                   for (x, y), (bx, by) in lines]
+        LI = lineintersection.LineIntersection(crowded)
+        self.assertEqual(LI.select_engine(), lineintersection.ENGINE_SWEEP)
+        LI = lineintersection.LineIntersection(lines[:10])
+        self.assertEqual(LI.select_engine(), lineintersection.ENGINE_SWEEP)
+        self.assertRaises(ValueError, LI.general_intersection, 'fastest')
+
+    def test_red_blue(self, trials = 30):
+
+        for trial in xrange(trials):
+            red, blue = [[[(random.randint(0, 9), random.randint(0, 9)),
+                           (random.randint(0, 9), random.randint(0, 9))]
+                          for i in xrange(random.randint(1, 8))]
+                         for colour in xrange(2)]
+            expected = sorted((id(lineA), id(lineB)) for lineA in red
+                              for lineB in blue
+                              if lineintersection.segments_intersect(lineA, lineB))
+            for engine in (lineintersection.ENGINE_SWEEP,
+                           lineintersection.ENGINE_GRID):
+                found = sorted((id(lineA), id(lineB)) for lineA, lineB, point in
+                               lineintersection.red_blue_intersections(
+                                   red, blue, engine))
+                self.assertEqual(found, expected)
+
+    def test_dynamic(self, steps = 300):
+
+        DLI   = lineintersection.DynamicLineIntersection()
+        lines = {}
+        for step in xrange(steps):
+            if lines and random.random() < 0.3:
+                label = random.choice(lines.keys())
+                self.assertEqual(DLI.remove_line(label), lines.pop(label))
+                continue
+            line = [(random.uniform(0, 20), random.uniform(0, 20))]
+            line.append((line[0][0] + random.uniform(-3, 3),
+                         line[0][1] + random.uniform(-3, 3)))
+            expected = sorted(label for label, other in lines.iteritems()
+                              if lineintersection.segments_intersect(line, other))
+            self.assertEqual(sorted(DLI.crossings(line)), expected)
+            self.assertEqual(DLI.crosses_any(line), bool(expected))
+            label = DLI.add_line(line)
+            lines[label] = line
+            self.assertEqual(sorted(DLI.crossings(line, label)), expected)
+        self.assertEqual(DLI.general_intersection(),
+                         lineintersection.LineIntersection(
+                             lines.values()).general_intersection())
+        self.assertRaises(ValueError, DLI.add_line, line, min(lines))
+
+    def test_dynamic_cell_size_follows(self):
+
+        """ A tiny first line, then long ones """
+        DLI = lineintersection.DynamicLineIntersection()
+        DLI.add_line([(0,0),(0.001,0)])
+        for k in xrange(1, 20):
+            DLI.add_line([(0,k),(900,k)])
+        self.assertTrue(DLI.index.cell_size > 100)
+        self.assertTrue(len(DLI.index.cells) < 1000)
+        self.assertEqual(len(DLI.crossings([(450,-1),(450,30)])), 19)
+
+        """ A long first line, then short ones """
+        DLI = lineintersection.DynamicLineIntersection([[(0,0),(1000,0)]])
+        for k in xrange(100):
+            DLI.add_line([(10*k,1),(10*k + 1,2)])
+        self.assertTrue(DLI.index.cell_size < 50)
+        self.assertTrue(max(len(bucket) for bucket in DLI.index.cells.values())
+                        < 10)
+        self.assertEqual(sorted(DLI.crossings([(0.5,0),(0.5,3)])), ['0', '1'])
+        fixed = lineintersection.DynamicLineIntersection(cell_size = 500)
+        for k in xrange(100):
+            fixed.add_line([(10*k,1),(10*k + 1,2)])
+        self.assertEqual(fixed.index.cell_size, 500)
+
+    def test_sweep_status(self):
+
+        status = sweepstatus.SweepStatus()
+        nodes  = dict((item, status.insert(item, cmp))
+                      for item in random.sample(xrange(100), 100))
+        self.assertEqual(list(status), range(100))
+        for item in xrange(0, 100, 3):
+            status.remove(nodes.pop(item))
+        self.assertEqual(list(status), sorted(nodes))
+        self.assertEqual(status.successor(nodes[50]).item, 52)
+        self.assertEqual(status.predecessor(nodes[50]).item, 49)
+        self.assertEqual(len(status), len(nodes))
+
+
+
+if __name__ == '__main__':
+    unittest.main()
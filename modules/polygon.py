@@ -5,11 +5,65 @@ Things to do:
 add unit tests
 """
 import math
+from array import array
+from itertools import chain
 
+import numpy
+
+import affine
+import prepared
+import rtree
+import segmentgrid
 import triangulate
 import lineintersection
 
 
+""" Storage modes for SimplePolygon vertices """
+STORAGE_LINKED = 'linked'
+STORAGE_ARRAY  = 'array'
+
+""" Validation levels for building a SimplePolygon, cheapest first """
+VALIDATE_NONE       = 'none'
+VALIDATE_DUPLICATES = 'duplicates'
+VALIDATE_SIMPLE     = 'simple'
+
+
+def flatten_coordinates(coordinates):
+    """
+    Returns coordinates as a flat array('d') [x0, y0, x1, y1, ...].
+    Accepts a flat sequence of numbers or a sequence of (x, y) pairs,
+    such as a list of tuples or an (n, 2) NumPy array.  An array('d')
+    is handed back as is, without copying.
+    """
+    if isinstance(coordinates, array) and coordinates.typecode == 'd':
+        return coordinates
+    if len(coordinates) and hasattr(coordinates[0], '__len__'):
+        return array('d', chain.from_iterable(coordinates))
+    return array('d', coordinates)
+
+
+def edge_key(edge):
+    """
+    Canonical, hashable form of an edge: its endpoints sorted, so an
+    edge and its reverse share a key.
+    """
+    first, second = tuple(edge[0]), tuple(edge[1])
+    return (first, second) if first <= second else (second, first)
+
+
+def buffer_signed_area(flat):
+    """
+    Shoelace formula straight over a flat coordinate buffer, taking
+    the vertices in buffer order.  Negative means clockwise, as with
+    SimplePolygon.total_signed_area.
+    """
+    n    = len(flat) // 2
+    area = 0.0
+    for i in xrange(n):
+        j     = (i + 1) % n
+        area += flat[2*i]*flat[2*j+1] - flat[2*j]*flat[2*i+1]
+    return 0.5*area
+
 
 class Vertice(object):
 
@@ -21,9 +75,55 @@ class Vertice(object):
     def __repr__(self):
         return "Vertice at %s." % repr(self.coord)
 
+
+class VerticeView(object):
+    """
+    Stand-in for Vertice used by array-backed polygons.  Only holds
+    the polygon and an index into its coordinate buffer, next/prev
+    are computed by index arithmetic, so views are created on demand
+    and cost nothing to throw away.  Two views are equal if they point
+    at the same slot of the same polygon.
+    """
+    __slots__ = ('polygon', 'index')
+
+    def __init__(self, polygon, index):
+        self.polygon = polygon
+        self.index   = index
+
+    def _get_coord(self):
+        return self.polygon.coordinate_at(self.index)
+
+    def _set_coord(self, coordinate):
+        """ Moves the vertice, unchecked, keeping its polygon current """
+        self.polygon._relocate(self, self.coord, tuple(coordinate))
+
+    coord = property(_get_coord, _set_coord)
+
+    @property
+    def next(self):
+        return VerticeView(self.polygon, self.polygon.next_index(self.index))
+
+    @property
+    def prev(self):
+        return VerticeView(self.polygon, self.polygon.prev_index(self.index))
+
+    def __eq__(self, other):
+        return (isinstance(other, VerticeView) and
+                self.polygon is other.polygon and self.index == other.index)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash((id(self.polygon), self.index))
+
+    def __repr__(self):
+        return "Vertice at %s." % repr(self.coord)
+
 """
 Polygon class
-- using doubly linked lists for vertices
+- using doubly linked lists for vertices, or a flat coordinate
+  buffer when initialized with storage = STORAGE_ARRAY
 """
 
 class SimplePolygon(object):
@@ -36,9 +136,11 @@ class SimplePolygon(object):
                 line with computer coordinate standards
                 of starting at the top left of the screen
     """
-    def __init__(self, coordinates, orientation_bool):
+    def __init__(self, coordinates, orientation_bool = None,
+                 storage = STORAGE_LINKED, validation = VALIDATE_DUPLICATES):
         """
-        orientation_bool is true for clockwise, false for ccw.
+        orientation_bool is true for clockwise, false for ccw, or None
+        to take it from the sign of the area of the coordinates.
         coordinates is a list of tuples denoting coordinates in
         the cartesian plane.
         The coordinates need to be listed in order of connection.
@@ -48,29 +150,214 @@ class SimplePolygon(object):
         seen below.  Note that self.head will become a vertice
         with data from coordinates[0].
 
+        storage chooses how vertices are kept.  STORAGE_LINKED builds
+        a Vertice per coordinate, STORAGE_ARRAY keeps one flat buffer
+        [x0, y0, x1, y1, ...] and hands out VerticeViews instead, which
+        is much lighter for very large polygons.
+
+        validation is one of VALIDATE_NONE (trust the input),
+        VALIDATE_DUPLICATES (the default, reject repeated vertices) or
+        VALIDATE_SIMPLE (also reject self-intersecting polygons).
+
         self.convex/concave_vertices are populated after some
         later methods, as with line_segments.
         """
-        self.coordinates      = coordinates
-        self.vertice_number   = self.count_vertices()
+        if storage not in (STORAGE_LINKED, STORAGE_ARRAY):
+            raise ValueError('Unknown storage mode %r' % storage)
+
+        if validation not in (VALIDATE_NONE, VALIDATE_DUPLICATES,
+                              VALIDATE_SIMPLE):
+            raise ValueError('Unknown validation level %r' % validation)
+
+        self._init_state(storage)
+        self.vertice_number   = len(coordinates)
+
+        """ Orientation initialization """
+        if orientation_bool is None:
+            """
+            Detected orientation: vertices are linked in the order they
+            were given and self.orientation reports which way that runs.
+            """
+            self.head        = self.orientate(coordinates, True, validation)
+            self.orientation = buffer_signed_area(
+                                   flatten_coordinates(coordinates)) < 0
+        elif orientation_bool:
+            self.head = self.orientate(coordinates, True, validation)
+        else:
+            self.head = self.orientate(coordinates, False, validation)
+
+        if validation == VALIDATE_SIMPLE and not self.polygon_is_simple():
+            raise ValueError('Polygon is not simple')
+
+
+    def _init_state(self, storage):
+        self.storage          = storage
+        self._buffer          = None
+        self._pending         = None
+        """ Set while a lazy transform reads self.buffer, see transform """
+        self._shared          = False
+        self._coordinates     = None
+        self._vertice_index   = None
+        self._head            = None
+        self._head_index      = 0
+        self._step            = 1
+        """ Slot links of an edited array-backed polygon, see _link_buffer """
+        self._links           = None
+        self._free            = []
+        self.vertice_number   = 0
         self.orientation      = None
-        self.head             = None
         self.line_segments    = None
         self.convex_vertices  = []
         self.concave_vertices = []
-
-        """ Orientation initialization """
-        if orientation_bool:
-            self.head = self.orientate(coordinates, True)
-        else:
-            self.head = self.orientate(coordinates)
+        """ Derived properties cache, see _cached """
+        self._cache           = {}
+        self.cache_hits       = 0
+        self.cache_misses     = 0
+        """ Running sums kept in incremental mode, see enable_incremental """
+        self._running         = None
+        """ Edge index for local simplicity checks, see build_edge_index """
+        self.edge_index       = None
+
+
+    @classmethod
+    def _lazy(cls, source, transform, vertice_number, step, head,
+              orientation):
+        """
+        Array-backed polygon of vertice_number vertices whose buffer is
+        transform applied to source, worked out on first read (see
+        _get_buffer).  Nothing is copied or checked here.
+        """
+        new_polygon = cls.__new__(cls)
+        new_polygon._init_state(STORAGE_ARRAY)
+        new_polygon._pending       = (source, transform)
+        new_polygon.vertice_number = vertice_number
+        new_polygon._step          = step
+        new_polygon._head_index    = head
+        new_polygon.orientation    = orientation
+        return new_polygon
+
+
+    @classmethod
+    def from_buffer(cls, coordinates, validation = VALIDATE_DUPLICATES,
+                    storage = STORAGE_ARRAY, copy = True):
+        """
+        Bulk constructor for large polygons.  coordinates is a flat
+        buffer [x0, y0, x1, y1, ...] or an (n, 2) sequence.  The
+        orientation is detected from the signed area and every check
+        is linear time, so with validation = VALIDATE_NONE building
+        costs a single pass.
+
+        With copy = False an array('d') becomes the polygon's buffer
+        as is.  The polygon then owns it: writing to it afterwards
+        leaves the polygon's caches and coordinate index stale.
+        """
+        flat = flatten_coordinates(coordinates)
+        if copy and flat is coordinates:
+            flat = array('d', flat)
+        if storage == STORAGE_LINKED:
+            flat = [(flat[i], flat[i+1]) for i in xrange(0, len(flat), 2)]
+        return cls(flat, None, storage, validation)
 
     """
     The following are methods for working with the vertices of
     the polygon object.
     """
 
-    def orientate(self, coordinates, clockwise = False):
+    def _get_coordinates(self):
+        """
+        The coordinates in the order they were given: from self.head,
+        running the same way round as the list the polygon was built
+        from, before and after edits alike.  Array-backed polygons
+        don't keep a list of tuples around, it is rebuilt when asked
+        for.  Linked polygons keep the list they were built from until
+        an edit, after which it is rebuilt on the next read instead of
+        being patched on every edit.
+        """
+        if self.storage == STORAGE_LINKED and self._coordinates is not None:
+            return self._coordinates
+        coords = list(self.ring())
+        if self._step == -1:
+            """ next runs backwards through the given list """
+            coords = coords[:1] + coords[:0:-1]
+        if self.storage == STORAGE_LINKED:
+            self._coordinates = coords
+        return coords
+
+    def _set_coordinates(self, coordinates):
+        """
+        Replaces every vertice, as building a new polygon from
+        coordinates with detected orientation would.
+        """
+        if self.storage == STORAGE_ARRAY:
+            flat = flatten_coordinates(coordinates)
+            coordinates = array('d', flat) if flat is coordinates else flat
+        self.head        = self.orientate(coordinates, True)
+        self.orientation = buffer_signed_area(
+                               flatten_coordinates(coordinates)) < 0
+
+    coordinates = property(_get_coordinates, _set_coordinates)
+
+
+    def _get_buffer(self):
+        """
+        Flat coordinate buffer of an array-backed polygon.  A lazily
+        transformed polygon (see transform) applies its pending
+        transform here, on first read.
+        """
+        if self._pending is not None:
+            source, transform = self._pending
+            self._pending = None
+            self._buffer  = transform.apply_buffer(source)
+        return self._buffer
+
+    def _set_buffer(self, buffer):
+        self._pending = None
+        self._shared  = False
+        self._buffer    = buffer
+        self._links     = None
+        self._free      = []
+        self._running   = None
+        self.edge_index = None
+        self.invalidate_cache()
+
+    buffer = property(_get_buffer, _set_buffer)
+
+
+    def _writable_buffer(self):
+        """
+        self.buffer, for writing to.  A lazy transform of this polygon
+        reads the buffer in place, so the first write after one works
+        on a copy instead.
+        """
+        if self._shared:
+            self._buffer = array('d', self._buffer)
+            self._shared = False
+        return self.buffer
+
+
+    def _get_head(self):
+        if self.storage == STORAGE_ARRAY:
+            return VerticeView(self, self._head_index)
+        return self._head
+
+    def _set_head(self, vertice):
+        """ coordinates and the cached edges start from the head """
+        if self.storage == STORAGE_ARRAY:
+            if vertice.index == self._head_index:
+                return
+            self._head_index = vertice.index
+        else:
+            if vertice is self._head:
+                return
+            self._head        = vertice
+            self._coordinates = None
+        self.invalidate_cache()
+
+    head = property(_get_head, _set_head)
+
+
+    def orientate(self, coordinates, clockwise = False,
+                  validation = VALIDATE_DUPLICATES):
         """
         This method creates a list of vertices with data from
         coordinates.  It then iterates over the list assigning
@@ -78,22 +365,60 @@ class SimplePolygon(object):
         finally returning the head of the polygon linked list.
         This is the meat behind initializing the Polygon Class.
         Note: you can also re-orientate the polygon using this.
+
+        For STORAGE_ARRAY the coordinates are copied into self.buffer
+        instead (see flatten_coordinates), and the direction is recorded
+        in self._step so that next/prev become index arithmetic.  Either
+        way self._step is 1 if next follows the list and -1 if it runs
+        backwards through it, see coordinates.
+
+        Duplicates are found while building the coordinate index, so the
+        check is linear and skipped entirely for VALIDATE_NONE.
+        Re-orientating switches incremental mode off and drops the edge
+        index.
         """
+        self.invalidate_cache()
+        self._running   = None
+        self.edge_index = None
+        if self.storage == STORAGE_ARRAY:
+            coordinates = flatten_coordinates(coordinates)
+            poly_sides  = len(coordinates) // 2
+        else:
+            poly_sides  = len(coordinates)
+
         """ Some Exception handling for initialization is done here. """
-        if len(coordinates) < 3:
+        if poly_sides < 3:
             raise ValueError('Polygons require at least 3 vertices.')
 
-        for coord in coordinates:
-            if coordinates.count(coord) != 1:
-                raise ValueError('Multiple vertices at same location')
-
-        vertices   = [Vertice(coord) for coord in coordinates]
-        poly_sides = len(vertices)
         orient_var = -1 if clockwise else 1
+        self._step = -orient_var
+
+        if self.storage == STORAGE_ARRAY:
+            self.buffer         = coordinates
+            self.vertice_number = poly_sides
+            self._head_index    = 0
+            self._vertice_index = None
+            self.orientation    = clockwise
+            if validation != VALIDATE_NONE:
+                self._index_buffer()
+                if len(self._vertice_index) != poly_sides:
+                    raise ValueError('Multiple vertices at same location')
+            return VerticeView(self, 0)
+
+        vertices = [Vertice(coord) for coord in coordinates]
 
         for i in xrange(poly_sides):
             vertices[i % poly_sides].prev = vertices[(i+orient_var) % poly_sides]
             vertices[i % poly_sides].next = vertices[(i-orient_var) % poly_sides]
+        """ Coordinate index used for O(1) lookups by find_vertice """
+        self._vertice_index = dict((vertice.coord, vertice)
+                                   for vertice in vertices)
+        if (validation != VALIDATE_NONE and
+                len(self._vertice_index) != poly_sides):
+            raise ValueError('Multiple vertices at same location')
+        self._coordinates   = list(coordinates)
+        self.vertice_number = poly_sides
+        self._head          = vertices[0]
         """
         self.orientation is set to clockwise argument and self.head
         becomes the first vertice in the list.
@@ -102,12 +427,222 @@ class SimplePolygon(object):
         return vertices[0]
 
 
+    def _cached(self, name, compute):
+        """
+        Returns the cached value of a derived property (area, centroid,
+        perimeter, edges, convexity), computing and storing it on a
+        miss.  Every method that changes the shape of the polygon calls
+        invalidate_cache, so a hit is always current.  cache_hits and
+        cache_misses count lookups.
+        """
+        if name in self._cache:
+            self.cache_hits += 1
+            return self._cache[name]
+        self.cache_misses += 1
+        value = self._cache[name] = compute()
+        return value
+
+
+    def invalidate_cache(self):
+        self._cache.clear()
+
+
+    def enable_incremental(self):
+        """
+        Switches on incremental mode: the sums behind the signed area,
+        the centroid and the perimeter are kept as running totals
+        [cross, centroid_x, centroid_y, perimeter] and every vertice
+        edit adjusts them from the two or three edges it changes, so
+        total_signed_area, centroid and get_perimeter become O(1) after
+        any edit.  Calling it again recomputes the totals from scratch,
+        which resets any floating point drift from long edit sessions.
+        """
+        running = [0.0, 0.0, 0.0, 0.0]
+        for edge in self.ring_pairs():
+            for i, term in enumerate(self._edge_terms(edge)):
+                running[i] += term
+        self._running = running
+
+
+    def disable_incremental(self):
+        self._running = None
+
+
+    def _edge_terms(self, edge):
+        """ Contribution of one edge to each running sum """
+        (x1, y1), (x2, y2) = edge
+        cross = 1.0*(x1*y2 - x2*y1)
+        return (cross, (x1 + x2)*cross, (y1 + y2)*cross,
+                math.sqrt((x2 - x1)**2 + (y2 - y1)**2))
+
+
+    def build_edge_index(self, cell_size = None):
+        """
+        Attaches a persistent segmentgrid.SegmentGrid of the edges to the
+        polygon, each edge keyed by the vertice it starts from.  Edits
+        keep it current, and insert/move/update_vertice use it to test
+        only the edges they create against the edges near them, instead
+        of re-checking the whole polygon.  The first checked edit builds
+        it if needed.  cell_size defaults to the mean edge length.
+        """
+        edges = list(self.ring_pairs())
+        if cell_size is None:
+            cell_size = segmentgrid.SegmentGrid.cell_size_for(edges)
+        self.edge_index = segmentgrid.SegmentGrid(cell_size)
+        for edge in edges:
+            self.edge_index.insert(edge[0], edge)
+        return self.edge_index
+
+
+    def _edges_changed(self, removed_edges, added_edges):
+        """
+        Every vertice edit reports the edges it takes out and puts in
+        here, before relinking, so that the cache, the running sums of
+        incremental mode and the edge index stay current.
+        """
+        self.invalidate_cache()
+        running = self._running
+        if running is not None:
+            for edge in removed_edges:
+                for i, term in enumerate(self._edge_terms(edge)):
+                    running[i] -= term
+            for edge in added_edges:
+                for i, term in enumerate(self._edge_terms(edge)):
+                    running[i] += term
+        if self.edge_index is not None:
+            for edge in removed_edges:
+                self.edge_index.remove(edge[0])
+            for edge in added_edges:
+                self.edge_index.insert(edge[0], edge)
+
+
+    def _edges_are_clear(self, edges):
+        """
+        Local simplicity check after an edit.  Only edges the edit put
+        in can have created an intersection, so each is tested against
+        the indexed edges sharing a grid cell with it.
+        """
+        for edge in edges:
+            for key in self.edge_index.candidates(edge):
+                if (key != edge[0] and lineintersection.segments_intersect(
+                                          edge, self.edge_index.segment(key))):
+                    return False
+        return True
+
+
+    def coordinate_at(self, index):
+        """ Coordinate tuple stored at index of an array-backed polygon """
+        return (self.buffer[2*index], self.buffer[2*index+1])
+
+
+    def next_index(self, index):
+        if self._links is not None:
+            return self._links[0][index]
+        return (index + self._step) % self.vertice_number
+
+
+    def prev_index(self, index):
+        if self._links is not None:
+            return self._links[1][index]
+        return (index - self._step) % self.vertice_number
+
+
+    def _link_buffer(self):
+        """
+        Before the first insert or remove, an array-backed polygon's
+        ring is the buffer itself, next and prev being index
+        arithmetic.  Editing switches it to links: arrays of the next
+        and prev slot of every slot, so that a vertice keeps its slot
+        (and its VerticeView index, and its entry in the coordinate
+        index) for good.  Removing a vertice frees its slot for the
+        next insert, and inserting appends to the buffer otherwise,
+        so every edit is O(1).  The buffer then holds the vertices in
+        no particular order, with free slots among them: read the
+        polygon through ring() or coordinates.
+        """
+        n = self.vertice_number
+        self._links = (array('l', [(i + self._step) % n for i in xrange(n)]),
+                       array('l', [(i - self._step) % n for i in xrange(n)]))
+        self._free  = []
+
+
+    def ring(self):
+        """
+        Yields the vertice coordinates in traversal (next) order,
+        starting at self.head.  Works for either storage mode, so the
+        edge/area methods below don't need to know how vertices are
+        kept.
+        """
+        if self.storage == STORAGE_ARRAY:
+            buf  = self.buffer
+            n    = self.vertice_number
+            step = self._step
+            i    = self._head_index
+            if self._links is not None:
+                following = self._links[0]
+                for _ in xrange(n):
+                    yield (buf[2*i], buf[2*i+1])
+                    i = following[i]
+                return
+            for _ in xrange(n):
+                yield (buf[2*i], buf[2*i+1])
+                i = (i + step) % n
+            return
+
+        cursor   = self.head
+        sentinel = cursor
+        yield cursor.coord
+        cursor = cursor.next
+        while cursor != sentinel:
+            yield cursor.coord
+            cursor = cursor.next
+
+
+    def ring_pairs(self):
+        """ Yields (coord, next coord) for every edge of the polygon """
+        first = previous = None
+        for coord in self.ring():
+            if previous is None:
+                first = coord
+            else:
+                yield previous, coord
+            previous = coord
+        yield previous, first
+
+
     def count_vertices(self):
-        return len(self.coordinates)
+        return self.vertice_number
 
 
     def coordinate_in_polygon(self, coord):
-        return True if coord in self.coordinates else False
+        return True if self.find_vertice(coord) is not None else False
+
+
+    def find_vertice(self, coord):
+        """
+        Returns the vertice (a VerticeView for array storage) sitting
+        at coord, or None.  This is a dictionary lookup, replacing the
+        cursor walks from self.head that every edit used to do.
+        """
+        if self.storage == STORAGE_ARRAY:
+            if self._vertice_index is None:
+                self._index_buffer()
+            index = self._vertice_index.get(coord)
+            return None if index is None else VerticeView(self, index)
+        return self._vertice_index.get(coord)
+
+
+    def _index_buffer(self):
+        """
+        Builds coord -> buffer slot for array storage, on the first
+        lookup.  Slots never move (see _link_buffer), so every edit
+        keeps the index up to date from then on.
+        """
+        index, i = {}, self._head_index
+        for _ in xrange(self.vertice_number):
+            index[self.coordinate_at(i)] = i
+            i = self.next_index(i)
+        self._vertice_index = index
 
 
     def remove_vertice(self, vertice_coord):
@@ -116,36 +651,82 @@ class SimplePolygon(object):
         - vertice coordinate is not in Polygon
         - polygon has 3 sides (2 sides is not a polygon)
         """
-        if not self.coordinate_in_polygon(vertice_coord):
+        cursor = self.find_vertice(vertice_coord)
+        if cursor is None:
             raise ValueError('Vertice not in polygon')
 
         elif self.vertice_number == 3:
             raise ValueError('Simple polygon must have three vertices')
 
         """
-        Removing vertice makes use of a cursor.  Initializing cursor at
-        self.head, we traverse the polygon until we reach the vertice
-        to be removed.  We change the vertices adjacent to connect with
-        eachother, and remove coordinate from self.coordinates, updating
-        self.vertice_number as well.
+        The vertice is looked up in the coordinate index.  We change the
+        vertices adjacent to connect with eachother, drop it from the
+        index, and update self.vertice_number as well.
         """
-
-        cursor = self.head
-        while cursor.coord != vertice_coord:
-            cursor = cursor.next
-        """ We have reached the desired vertice"""
+        prev, following = cursor.prev.coord, cursor.next.coord
+        self._edges_changed(((prev, vertice_coord), (vertice_coord, following)),
+                            ((prev, following),))
+        if self.storage == STORAGE_ARRAY:
+            self._buffer_remove(cursor.index)
+            return
         cursor.prev.next = cursor.next
         cursor.next.prev = cursor.prev
         """ Dealing with case where removed vertice was self.head """
         if cursor == self.head:
             self.head = cursor.next
         """ Tidying up and updating polygon attributes """
-        cursor = None
-        self.coordinates.remove(vertice_coord)
+        del self._vertice_index[vertice_coord]
+        self._coordinates    = None
         self.vertice_number -= 1
         return
 
 
+    def _buffer_remove(self, index):
+        """
+        Array-backed counterpart of unlinking a vertice: slot index is
+        linked out and freed (see _link_buffer), and the head moves on
+        to the next vertice if it was the one removed.
+        """
+        if self._links is None:
+            self._link_buffer()
+        following, previous = self._links
+        if index == self._head_index:
+            self._head_index = following[index]
+        following[previous[index]] = following[index]
+        previous[following[index]] = previous[index]
+        self._free.append(index)
+        if self._vertice_index is not None:
+            del self._vertice_index[self.coordinate_at(index)]
+        self.vertice_number -= 1
+
+
+    def _buffer_insert(self, index, vertice_coord):
+        """
+        Puts vertice_coord in a free slot, or a new one at the end of
+        the buffer, linked in right before the vertice at index when
+        following next.  Returns the slot.
+        """
+        if self._links is None:
+            self._link_buffer()
+        following, previous = self._links
+        buf = self._writable_buffer()
+        if self._free:
+            slot = self._free.pop()
+            buf[2*slot], buf[2*slot+1] = vertice_coord[0], vertice_coord[1]
+        else:
+            slot = len(buf) // 2
+            buf.extend((vertice_coord[0], vertice_coord[1]))
+            following.append(0)
+            previous.append(0)
+        before = previous[index]
+        following[before], previous[slot] = slot, before
+        following[slot], previous[index]  = index, slot
+        if self._vertice_index is not None:
+            self._vertice_index[(buf[2*slot], buf[2*slot+1])] = slot
+        self.vertice_number += 1
+        return slot
+
+
     def insert_vertice(self, insertion_point, vertice_coord):
         """
         Similar method to remove_vertice.  Locates insertion_point and
@@ -153,57 +734,90 @@ class SimplePolygon(object):
         the appropriate vertice connections so that the new vertice
         comes before the insertion_point in the polygon.  Updates
         polygon, and then checks if it remains simple.  If not, applies
-        self.remove_vertice immediately.
+        self.remove_vertice immediately.  The check only looks at the
+        two new edges, see build_edge_index.
         """
-        if not self.coordinate_in_polygon(insertion_point):
+        cursor = self.find_vertice(insertion_point)
+        if cursor is None:
             raise ValueError('Insertion point not in polygon')
-        """
-        Should refactor this into another function, it is repeatedly
-        occuring:
-        """
-        cursor = self.head
-        while cursor.coord != insertion_point:
-            cursor = cursor.next
-        """ Updating vertice connections """
-        new_vertice                        = Vertice(vertice_coord)
-        new_vertice.prev, new_vertice.next = cursor.prev, cursor
-        cursor.prev.next                   = new_vertice
-        cursor.prev                        = new_vertice
-        """ Updating polygon data """
-        cursor_index = self.coordinates.index(cursor.coord)
-        self.coordinates.insert(cursor_index, vertice_coord)
-        self.vertice_number += 1
+
+        elif self.coordinate_in_polygon(vertice_coord):
+            raise ValueError('Multiple vertices at same location')
+
+        if self.edge_index is None:
+            self.build_edge_index()
+        prev      = cursor.prev.coord
+        new_edges = ((prev, vertice_coord), (vertice_coord, insertion_point))
+        self._edges_changed(((prev, insertion_point),), new_edges)
+        was_head = cursor == self.head
+        if self.storage == STORAGE_ARRAY:
+            new_vertice = VerticeView(
+                self, self._buffer_insert(cursor.index, vertice_coord))
+        else:
+            """ Updating vertice connections """
+            new_vertice                        = Vertice(vertice_coord)
+            new_vertice.prev, new_vertice.next = cursor.prev, cursor
+            cursor.prev.next                   = new_vertice
+            cursor.prev                        = new_vertice
+            """ Updating polygon data """
+            self._vertice_index[vertice_coord] = new_vertice
+            self._coordinates    = None
+            self.vertice_number += 1
         """ Checking if polygon remains simple """
-        if not self.is_simple():
-            self.remove(vertice_coord)
+        if not self._edges_are_clear(new_edges):
+            self.remove_vertice(vertice_coord)
             raise ValueError('Resultant polygon is not simple')
         """ Addressing case where cursor was self.head """
-        if not cursor_index:
+        if was_head:
             self.head = new_vertice
         return
 
 
+    def _relocate(self, cursor, old_coord, new_coord):
+        """
+        Moves cursor to new_coord, keeping the coordinate index, the
+        cache and the running sums in step.  Setting the coord of a
+        VerticeView comes here too.  Returns the two edges now meeting
+        at the vertice.
+        """
+        prev, following = cursor.prev.coord, cursor.next.coord
+        new_edges       = ((prev, new_coord), (new_coord, following))
+        self._edges_changed(((prev, old_coord), (old_coord, following)),
+                            new_edges)
+        if self.storage == STORAGE_ARRAY:
+            buffer = self._writable_buffer()
+            buffer[2*cursor.index]   = new_coord[0]
+            buffer[2*cursor.index+1] = new_coord[1]
+        else:
+            cursor.coord = new_coord
+        if self._vertice_index is not None:
+            del self._vertice_index[old_coord]
+            self._vertice_index[new_coord] = (
+                cursor.index if self.storage == STORAGE_ARRAY else cursor)
+        self._coordinates = None
+        return new_edges
+
+
     def move_vertice(self, old_coord, new_coord):
         """
-        Identical traversal as insert/remove_vertice.  Locates vertex,
-        and updates its coordinate and self.coordinates.  It then checks
-        if new polygon is simple, and will revert if not and raise an
-        exception.
+        Locates vertex through the coordinate index, and updates its
+        coordinate.  It then checks if new polygon is simple, and will
+        revert if not and raise an exception.  Only the two edges at the
+        vertice are checked, see build_edge_index.
         """
-        if not self.coordinate_in_polygon(old_coord):
+        cursor = self.find_vertice(old_coord)
+        if cursor is None:
             raise ValueError('Vertice not in polygon')
-        """ Traversal """
-        cursor = self.head
-        while cursor.coord != old_coord:
-            cursor = cursor.next
+
+        elif self.coordinate_in_polygon(new_coord):
+            raise ValueError('Multiple vertices at same location')
+        if self.edge_index is None:
+            self.build_edge_index()
         """ Updating coordinates """
-        cursor.coord    = new_coord
-        old_coord_index = self.coordinates.index(old_coord)
-        self.coordinates[old_coord_index] = new_coord
+        new_edges = self._relocate(cursor, old_coord, new_coord)
         """ Checking if polygon remains simple """
-        if not self.is_simple():
-            cursor.coord = old_coord
-            self.coordinates[old_coord_index] = old_coord
+        if not self._edges_are_clear(new_edges):
+            self._relocate(cursor, new_coord, old_coord)
             raise ValueError('Resultant polygon is not simple')
         return
 
@@ -214,18 +828,19 @@ class SimplePolygon(object):
         resultant polygon is still simple.  If not, reverts and
         raises ValueError.
         """
-        if not self.coordinate_in_polygon(old_coord):
+        cursor = self.find_vertice(old_coord)
+        if cursor is None:
             raise ValueError('Vertice not in polygon')
 
-        cursor = self.head
-        """ Finding vertice to update """
-        while cursor.coord != coord:
-            cursor = cursor.next
+        elif self.coordinate_in_polygon(new_coord):
+            raise ValueError('Multiple vertices at same location')
 
+        if self.edge_index is None:
+            self.build_edge_index()
         """ Updating and reverting if not simple """
-        cursor.coord = new_coord
-        if not self.is_simple():
-            cursor.coord = old_coord
+        new_edges = self._relocate(cursor, old_coord, new_coord)
+        if not self._edges_are_clear(new_edges):
+            self._relocate(cursor, new_coord, old_coord)
             raise ValueError('Resultant polygon is not simple')
 
 
@@ -263,77 +878,97 @@ class SimplePolygon(object):
         Returns new cartesian coordinate tuple by calculating
         changes to vertice done by translation_vector.
         """
-        x_translated = vertice.coord[0] + translation[0]
-        y_translated = vertice.coord[1] + translation[1]
+        x_translated = vertice.coord[0] + translation_vector[0]
+        y_translated = vertice.coord[1] + translation_vector[1]
         return (x_translated, y_translated)
 
     """
     The following methods are for changing the polygon as a whole.
     """
 
-    def rotate_polygon(self, angle, radians = False, clockwise = False):
+    def transform(self, transform, lazy = False):
         """
-        Rotates polygon by angle argument.  Should make it possible
-        to input radians instead.  This works by applying the rotation
-        to each coordinate and initializing a new polygon class to return.
+        Returns a new polygon with transform (an affine.AffineTransform)
+        applied to every vertice in one pass over the coordinates,
+        keeping this polygon's head and direction.  Chain rotations,
+        scales and translations with AffineTransform.then first and the
+        whole chain still costs one pass.
+
+        With lazy = True the result is an array-backed polygon that only
+        stores the transform, and applies it the first time its
+        coordinates are read.  Transforming a lazy polygon again just
+        composes the transforms.
         """
-        new_coords    = []
-        centroid      = self.centroid()
-        angle         = math.radians(angle) if not radians else angle
-        first_vertice = self.head
-        sentinel      = first_vertice
-
-        new_coords.append(
-            self.rotate_vertice_about_point(first_vertice, centroid, angle))
-
-        """ Traversal """
-        first_vertice = first_vertice.next
-        while first.vertice != sentinel:
-            """
-            If oriented CCW then add in before previous coordinate.
-            Initialization list must be in clockwise order.
-            """
-            if self.orientation:
-                new_coords.append(self.rotate_vertice_about_point(
-                                   first_vertice, centroid, angle))
-            else:
-                new_coords.insert(0, self.rotate_vertice_about_point(
-                                      first_vertice, centroid, angle))
-            first_vertice = first_vertice.next
+        determinant = transform.determinant()
+        if determinant == 0:
+            raise ValueError('Resultant polygon would be degenerate')
+        """ Mirroring transforms reverse the direction of the ring """
+        orientation = self.orientation != (determinant < 0)
 
-        return Polygon(new_coords, clockwise)
+        """
+        The source is read in given order (see coordinates) and
+        nothing is copied: an array-backed polygon shares its buffer
+        (see _writable_buffer), a linked one its coordinate list, and
+        a lazy one its own source, composing the transforms.
+        """
+        combined = transform
+        if self._pending is not None:
+            source   = self._pending[0]
+            combined = self._pending[1].then(transform)
+        elif self.storage == STORAGE_ARRAY and self._links is None:
+            source = self.buffer
+        else:
+            source = self.coordinates
+        if self.storage == STORAGE_ARRAY and self._links is None:
+            step, head = self._step, self._head_index
+        else:
+            step, head = self._step, 0
+
+        if lazy:
+            new_polygon = SimplePolygon._lazy(source, combined,
+                                              self.vertice_number, step,
+                                              head, orientation)
+            if source is self._buffer:
+                self._shared = True
+            if 'centroid' in self._cache:
+                new_polygon._cache['centroid'] = transform.apply(
+                                                     self._cache['centroid'])
+            return new_polygon
+
+        flat = combined.apply_buffer(source)
+        if self.storage == STORAGE_ARRAY:
+            new_polygon = SimplePolygon(flat, True, STORAGE_ARRAY,
+                                        VALIDATE_NONE)
+            new_polygon._step       = step
+            new_polygon._head_index = head
+        else:
+            new_polygon = SimplePolygon(
+                              [(flat[i], flat[i+1])
+                               for i in xrange(0, len(flat), 2)],
+                              step == 1, STORAGE_LINKED, VALIDATE_NONE)
+        new_polygon.orientation = orientation
+        return new_polygon
 
 
-    def translate_polygon(self, translation, clockwise = False):
+    def rotate_polygon(self, angle, radians = False, lazy = False):
         """
-        Follows similar form to rotate_polygon.  Traverses polygon
-        and creates new initialization list by translating each
-        coordinate.  It then uses this list to return a new polygon.
+        Rotates polygon counter-clockwise about its centroid by angle,
+        given in degrees unless radians is set.  See transform.
         """
-        new_coords = []
-        first_vertice = self.head
-        sentinel = first
+        angle = math.radians(angle) if not radians else angle
+        return self.transform(
+            affine.AffineTransform.rotation(angle, self.centroid()), lazy)
 
-        new_coords.append(
-            self.translate_vertice(first_vertice, translation))
-        """ Traversal """
-        first_vertice = first_vertice.next
-        while first_vertice != sentinel:
-            if self.orientation:
-                new_coords.append(
-                    self.translate_vertice(first_vertice, translation))
-            else:
-                new_coords.insert(0, self.translate_vertice(
-                                 first_vertice, translation))
-            first_vertice = first.next
 
-        return Polygon(new_coords, clockwise)
+    def translate_polygon(self, translation, lazy = False):
+        """ Translates polygon by the translation vector.  See transform """
+        return self.transform(
+            affine.AffineTransform.translation(translation), lazy)
 
 
-    def scale_polygon(self, scale, clockwise = False):
+    def scale_polygon(self, scale, lazy = False):
         """
-        Similar to translate_polygon, traverses polygon creating a
-        new coordinate list to initialize a scaled polygon.
+        Scales polygon away from its centroid.  See transform.
         """
         """
         We are not allowing degenerate polygons.  Due to computer
@@ -343,27 +978,9 @@ class SimplePolygon(object):
         if scale == 0:
             raise ValueError('Resultant polygon would be too small')
 
-        new_coords    = []
-        centroid      = self.centroid()
-        first_vertice = self.head
-        sentinel      = first_vertice
-
-        new_coords.append(
-            self.scale_vertice_from_point(first_vertice, centroid, abs(scale)))
-        """ Traversal """
-        first_vertice = first.next
-        while first_vertice != sentinel:
-            if self.orientation:
-                new_coords.append(
-                    self.scale_vertice_from_point(
-                        first_vertice, centroid, abs(scale)))
-            else:
-                new_coords.insert(
-                    0, self.scale_vertice_from_point(
-                        first_vertice, centroid, abs(scale)))
-            first_vertice = first_vertice.next
-
-        return Polygon(new_coords, clockwise)
+        return self.transform(
+            affine.AffineTransform.scaling(abs(scale),
+                                           point = self.centroid()), lazy)
 
     """
     The following methods have to do with treating the edges of the
@@ -372,28 +989,17 @@ class SimplePolygon(object):
 
     def get_edges(self):
         """
-        Returns list of line segments in the form [(x1,y1), (x2,y2)].
-        Traverses through linked list, adding line segments until
-        reaching sentinel vertice.
-        """
-        first_vertice  = self.head
-        second_vertice = self.head.next
-        sentinel       = first_vertice
-        line_segments  = []
-        """ Initial line is added """
-        line_segments.append([first_vertice.coord, second_vertice.coord])
-
-        first_vertice  = second_vertice
-        second_vertice = first_vertice.next
-        """ Start of traversal """
-        while first_vertice != sentinel:
-            line_segments.append([first_vertice.coord, second_vertice.coord])
-            first_vertice  = second_vertice
-            second_vertice = first_vertice.next
+        Returns a tuple of line segments in the form ((x1,y1), (x2,y2)).
+        Walks the ring (see ring_pairs), adding line segments until
+        reaching the head again.  The tuple is cached (see _cached),
+        and being immutable can be handed out as is.
+        """
+        line_segments = self._cached('edges', lambda:
+                            tuple(self.ring_pairs()))
         """ Assigning list of line segments to polygon attributes """
         self.line_segments = line_segments
         """
-        List is used later for determining if any lines intersect
+        Tuple is used later for determining if any lines intersect
         and so is returned.
         """
         return line_segments
@@ -411,53 +1017,178 @@ class SimplePolygon(object):
     def get_perimeter(self):
         """
         Traverses identically to in get_edges().  Piggybacks get_length
-        while doing so and returns sum of lengths.
+        while doing so and returns sum of lengths.  Cached, or read from
+        the running sums in incremental mode.
         """
-        first_vertice = self.head
-        second_vertice = first_vertice.next
-        sentinel = first_vertice
+        if self._running is not None:
+            return self._running[3]
+        return self._cached('perimeter', lambda:
+                   sum(self.get_length(pair) for pair in self.ring_pairs()))
 
-        segment_lengths = []
-        segment_lengths.append(self.get_length(
-                          [first_vertice.coord,
-                          second_vertice.coord]))
 
-        first_vertice  = second_vertice
-        second_vertice = first_vertice.next
-        """ Start of traversal """
-        while first_vertice != sentinel:
-            segment_lengths.append(self.get_length(
-                              [first_vertice.coord,
-                              second_vertice.coord]))
-            first_vertice  = second_vertice
-            second_vertice = first_vertice.next
-        return sum(segment_lengths)
+    def edge_keys(self):
+        """ Set of edge_key of every edge.  Cached. """
+        return self._cached('edge_keys', lambda:
+                   set(edge_key(edge) for edge in self.ring_pairs()))
 
 
     def share_edge(self, other):
         """
         Method for determining whether two polygons share
-        a particular edge.  Brute force, need to look up
-        a nicer way to do this.
+        a particular edge.  Both edge sets are hashed by edge_key
+        (and cached), so this is O(n + m) rather than comparing every
+        pair of edges.
         """
-        edges_self = self.get_edges()
-        edges_othr = other.get_edges()
+        return not self.edge_keys().isdisjoint(other.edge_keys())
 
-        for slf in edges_self:
-            for otr in edges_othr:
-                if slf == otr or slf == [otr[1], otr[0]]:
-                    return True
-        return False
+
+    def bounding_box(self):
+        """ (min_x, min_y, max_x, max_y) of the vertices.  Cached. """
+        return self._cached('bounding_box', self._bounding_box)
+
+
+    def _bounding_box(self):
+        coords = list(self.ring())
+        xs     = [coord[0] for coord in coords]
+        ys     = [coord[1] for coord in coords]
+        return (min(xs), min(ys), max(xs), max(ys))
+
+
+    def prepare(self):
+        """
+        Returns a prepared.PreparedPolygon for fast point in polygon
+        queries.  Cached, so it is only rebuilt after an edit.
+        """
+        return self._cached('prepared', lambda: prepared.PreparedPolygon(self))
 
 
     def polygon_is_simple(self):
         """
-        See Line Intersection Class for details.
+        True if no two edges meet except adjacent edges at their shared
+        vertice.  Shamos-Hoey sweep, O(n log n), or a grid broad phase
+        for many evenly spread edges, see Line Intersection Class for
+        details.
         """
         LI = lineintersection.LineIntersection(
                               self.get_edges())
         return not LI.general_intersection()
 
+    """
+    The following methods relate the polygon to another one.  Touching
+    counts: polygons meeting only along their boundaries intersect, and
+    a polygon contains another lying inside it even where their
+    boundaries touch.
+    """
+
+    def boundary_crossings(self, other, engine = lineintersection.ENGINE_AUTO):
+        """
+        Yields (edge, other edge, point) wherever an edge of the polygon
+        meets an edge of other, without testing either polygon's edges
+        against its own (see lineintersection.red_blue_intersections).
+        """
+        return lineintersection.red_blue_intersections(
+                   self.get_edges(), other.get_edges(), engine)
+
+
+    def intersects(self, other):
+        """
+        True if the polygons have any point in common.  Disjoint
+        bounding boxes are rejected at once, and two convex polygons
+        are decided by the separating axis test (see separated_from).
+        Otherwise they meet if their boundaries do, through a crossing
+        or a shared vertice, or else if one lies inside the other,
+        which a single vertice tells.
+        """
+        if not rtree.boxes_overlap(self.bounding_box(), other.bounding_box()):
+            return False
+        if self.polygon_is_convex() and other.polygon_is_convex():
+            return not self.separated_from(other)
+        for crossing in self.boundary_crossings(other):
+            return True
+        if any(other.coordinate_in_polygon(coord) for coord in self.ring()):
+            return True
+        return (other.prepare().contains(next(self.ring())) or
+                self.prepare().contains(next(other.ring())))
+
+
+    def separated_from(self, other):
+        """
+        Separating axis theorem for two convex polygons: they are
+        disjoint if and only if the origin lies strictly outside their
+        Minkowski difference, self + (-other), the convex polygon whose
+        edges are the edges of both taken in order of angle.  Both
+        rings are read once and their edges merged, O(n + m).  Points
+        on the difference's boundary are touching polygons, which
+        don't count as separated.
+        """
+        def counter_clockwise(pgon, sign):
+            coords = [(sign*x, sign*y) for x, y in pgon.ring()]
+            if pgon.total_signed_area() < 0:
+                coords.reverse()
+            """ Start from the lowest vertice, leftmost on ties """
+            start = min(xrange(len(coords)),
+                        key = lambda i: (coords[i][1], coords[i][0]))
+            coords = coords[start:] + coords[:start]
+            return coords + coords[:2]
+
+        P, Q = counter_clockwise(self, 1), counter_clockwise(other, -1)
+        n, m = len(P) - 2, len(Q) - 2
+        difference, i, j = [], 0, 0
+        while i < n or j < m:
+            difference.append((P[i][0] + Q[j][0], P[i][1] + Q[j][1]))
+            cross = ((P[i+1][0] - P[i][0])*(Q[j+1][1] - Q[j][1]) -
+                     (P[i+1][1] - P[i][1])*(Q[j+1][0] - Q[j][0]))
+            if cross >= 0 and i < n:
+                i += 1
+            if cross <= 0 and j < m:
+                j += 1
+
+        for k in xrange(len(difference)):
+            (ax, ay), (bx, by) = difference[k - 1], difference[k]
+            if (bx - ax)*(-ay) - (by - ay)*(-ax) < 0:
+                return True
+        return False
+
+
+    def contains(self, other):
+        """
+        True if no point of other lies outside the polygon.  Needs
+        other's bounding box inside ours and every vertice of other
+        inside or on the polygon (see prepare), which is enough when
+        the polygon is convex.  Otherwise each edge of other is also
+        cut where it meets our boundary, and a point of every piece
+        between the cuts must be inside or on the polygon.
+        """
+        box, inner = self.bounding_box(), other.bounding_box()
+        if not (box[0] <= inner[0] and box[1] <= inner[1] and
+                inner[2] <= box[2] and inner[3] <= box[3]):
+            return False
+        located = self.prepare()
+        if not all(located.contains(coord) for coord in other.ring()):
+            return False
+        if self.polygon_is_convex():
+            return True
+
+        cuts = {}
+        for edge, mine, point in other.boundary_crossings(self):
+            on_edge = [coord for coord in mine
+                       if lineintersection.orientation(edge[0], edge[1], coord) == 0
+                       and min(edge[0], edge[1]) <= coord <= max(edge[0], edge[1])]
+            cuts.setdefault(id(edge), [edge]).extend([point] + on_edge)
+        for points in cuts.itervalues():
+            (ax, ay), (bx, by) = points[0]
+            along  = lambda coord: (coord[0] - ax)*(bx - ax) + (coord[1] - ay)*(by - ay)
+            points = sorted(set([(ax, ay), (bx, by)] + points[1:]), key = along)
+            for (px, py), (qx, qy) in zip(points, points[1:]):
+                if not located.contains(((px + qx)/2.0, (py + qy)/2.0)):
+                    return False
+        return True
+
+
+    def within(self, other):
+        """ True if no point of the polygon lies outside other """
+        return other.contains(self)
+
     """
     The following methods have to do with the area of the
     simple polygon.
@@ -474,23 +1205,18 @@ class SimplePolygon(object):
         around the polygon, we end up with the total area.  It is very
         important that you cycle in one direction(say cyclically) and
         that it is a simple closed polygon in order for this to work.
+        Cached, or read from the running sums in incremental mode.
         """
-        first_vertice     = self.head
-        second_vertice    = first_vertice.next
-        sentinel          = first_vertice
+        if self._running is not None:
+            return 0.5*self._running[0]
+        return self._cached('signed_area', self._total_signed_area)
 
-        """ Formula to calculate each partial area as mentioned above """
-        partial_area_calc = lambda x: 1.0*(x[0].coord[0]*x[1].coord[1] -
-                                           x[1].coord[0]*x[0].coord[1])
-
-        area              = partial_area_calc([first_vertice, second_vertice])
-        first_vertice     = second_vertice
-        second_vertice    = first_vertice.next
 
-        while first_vertice != sentinel:
-            area += partial_area_calc([first_vertice, second_vertice])
-            first_vertice  = second_vertice
-            second_vertice = first_vertice.next
+    def _total_signed_area(self):
+        area = 0.0
+        """ Formula to calculate each partial area as mentioned above """
+        for first, second in self.ring_pairs():
+            area += 1.0*(first[0]*second[1] - second[0]*first[1])
 
         return 0.5*area
 
@@ -515,33 +1241,39 @@ class SimplePolygon(object):
         with a sentinel, and make calculations at each
         point in order to combine them to find the centroid,
         which ends up being a sort of weighted average of each
-        of the calculations (see the wiki).
-        """
-        signed_area    = self.total_signed_area()
-        first_vertice  = self.head
-        second_vertice = first_vertice.next
-        sentinel       = first_vertice
-        helper_fn      = lambda x: 1.0*(x[0].coord[0]*x[1].coord[1] -
-                                        x[1].coord[0]*x[0].coord[1])
-        """ First calculations: """
-        centroid_x = (1.0*(first_vertice.coord[0] + second_vertice.coord[0]) *
-                                  helper_fn([first_vertice, second_vertice]))
-        centroid_y = (1.0*(first_vertice.coord[1] + second_vertice.coord[1]) *
-                                  helper_fn([first_vertice, second_vertice]))
-
-        first_vertice  = second_vertice
-        second_vertice = first_vertice.next
+        of the calculations (see the wiki).  Cached, or read from the
+        running sums in incremental mode.
+        """
+        if self._running is not None:
+            cross, centroid_x, centroid_y = self._running[:3]
+            return (centroid_x/(3*cross), centroid_y/(3*cross))
+        return self._cached('centroid', self._centroid)
+
+
+    def _centroid(self):
+        if self._pending is not None:
+            """ Centroids commute with affine maps: no need to materialize """
+            source, transform = self._pending
+            points = affine.as_points(source)
+            x, y   = points[:, 0], points[:, 1]
+            next_x = numpy.roll(x, -1)
+            next_y = numpy.roll(y, -1)
+            cross  = x*next_y - next_x*y
+            area3  = 3*cross.sum()
+            return transform.apply((((x + next_x)*cross).sum()/area3,
+                                    ((y + next_y)*cross).sum()/area3))
+        signed_area = self.total_signed_area()
+        centroid_x  = 0.0
+        centroid_y  = 0.0
         """ Traversal """
-        while first_vertice != sentinel:
-            centroid_x += (1.0*(first_vertice.coord[0] + second_vertice.coord[0]) *
-                                       helper_fn([first_vertice, second_vertice]))
-            centroid_y += (1.0*(first_vertice.coord[1] + second_vertice.coord[1]) *
-                                       helper_fn([first_vertice, second_vertice]))
-            first_vertice  = second_vertice
-            second_vertice = first_vertice.next
+        for first, second in self.ring_pairs():
+            cross       = 1.0*(first[0]*second[1] - second[0]*first[1])
+            centroid_x += (first[0] + second[0])*cross
+            centroid_y += (first[1] + second[1])*cross
 
         return ((1/(6*signed_area))*centroid_x, (1/(6*signed_area))*centroid_y)
 
+
     def vertice_is_convex(self, vertice):
 
         """
@@ -562,10 +1294,16 @@ class SimplePolygon(object):
         correspond to the coordinates of the previous, vertice_to_test,
         and the next vertice respectively.
         """
-        x = vertice.prev.coord
-        y = vertice.coord
-        z = vertice.next.coord
+        return self.coords_are_convex(vertice.prev.coord, vertice.coord,
+                                      vertice.next.coord)
+
 
+    def coords_are_convex(self, x, y, z):
+        """
+        Body of vertice_is_convex working on the coordinates of the
+        previous, tested and next vertice directly, so that it can be
+        used while walking the ring without any Vertice objects.
+        """
         signed_area = (x[0]*y[1] + y[0]*z[1] + z[0]*x[1] -
                        y[0]*x[1] - z[0]*y[1] - x[0]*z[1])
 
@@ -576,37 +1314,42 @@ class SimplePolygon(object):
 
 
     def polygon_is_convex(self):
-        """ Applies all_convex_vertices and analyzes """
-        self.all_convex_vertices()
-        return True if not self.concave_vertices else False
+        """ Applies vertice_is_convex around the ring.  Cached. """
+        return self._cached('convex', self._polygon_is_convex)
+
+
+    def _polygon_is_convex(self):
+        """
+        Walks the ring once as all_convex_vertices does, but stops at
+        the first concave vertice rather than sorting every vertice.
+        """
+        ring   = self.ring()
+        first  = x = next(ring)
+        second = y = next(ring)
+        for z in chain(ring, (first, second)):
+            if not self.coords_are_convex(x, y, z):
+                return False
+            x, y = y, z
+        return True
 
 
     def all_convex_vertices(self):
         """
-        Traverses through polygon using a sentinel to stop,
-        applying vertice_is_convex at each vertice.
+        Walks the ring once, applying the vertice_is_convex test to
+        every (prev, vertice, next) triple of coordinates.
         """
         """ Resetting self.convex/concave """
         self.convex_vertices  = []
         self.concave_vertices = []
 
-        cursor   = self.head
-        sentinel = cursor
-
-        if self.vertice_is_convex(cursor):
-            self.convex_vertices.append(cursor.coord)
-        else:
-            self.concave_vertices.append(cursor.coord)
-
-        cursor = cursor.next
-        while cursor != sentinel:
-
-            if self.vertice_is_convex(cursor):
-                self.convex_vertices.append(cursor.coord)
+        coords = list(self.ring())
+        sides  = len(coords)
+        for i in xrange(sides):
+            if self.coords_are_convex(coords[i-1], coords[i],
+                                      coords[(i+1) % sides]):
+                self.convex_vertices.append(coords[i])
             else:
-                self.concave_vertices.append(cursor.coord)
-
-            cursor = cursor.next
+                self.concave_vertices.append(coords[i])
 
 
     def __repr__(self):
@@ -5,7 +5,9 @@ This file contains test methods for polygon.py.
 import unittest
 import random
 import math
+from array import array
 
+import affine
 import polygon
 
 
@@ -120,5 +122,336 @@ class TestPolygon(unittest.TestCase):
         self.assertNotEqual(pgon1_tsa, pgon2_tsa)
         self.assertEqual(abs(pgon1_tsa), abs(pgon2_tsa))
 
+    def test_vertice_index(self):
+
+        for storage in (polygon.STORAGE_LINKED, polygon.STORAGE_ARRAY):
+            for clockwise in (True, False):
+                example = [(0,0),(0,2),(1,3),(2,2),(2,0)]
+                pgon    = polygon.SimplePolygon(list(example), clockwise,
+                                                storage = storage)
+                self.assertEqual(pgon.find_vertice((1,3)).coord, (1,3))
+                self.assertEqual(pgon.find_vertice((5,5)), None)
+
+                pgon.remove_vertice((1,3))
+                self.assertFalse(pgon.coordinate_in_polygon((1,3)))
+                self.assertEqual(pgon.coordinates, [(0,0),(0,2),(2,2),(2,0)])
+                self.assertEqual(pgon.count_vertices(), 4)
+                self.assertRaises(ValueError, pgon.move_vertice, (0,0), (2,0))
+                self.assertRaises(ValueError, pgon.insert_vertice, (0,0), (0,2))
+
+    def test_property_cache(self):
+
+        example = [(0,0),(0,2),(1,3),(2,2),(2,0)]
+        pgon    = polygon.SimplePolygon(list(example), True)
+        area    = pgon.total_signed_area()
+        pgon.centroid()
+        pgon.centroid()
+        pgon.get_perimeter()
+        self.assertEqual(pgon.total_signed_area(), area)
+        self.assertEqual(pgon.cache_misses, 3)
+        self.assertEqual(pgon.cache_hits, 3)
+
+        pgon.remove_vertice((1,3))
+        self.assertAlmostEqual(pgon.total_area(), 4)
+        self.assertAlmostEqual(pgon.get_perimeter(), 8)
+        self.assertEqual(pgon.cache_misses, 5)
+
+    def test_incremental_measures(self):
+
+        for storage in (polygon.STORAGE_LINKED, polygon.STORAGE_ARRAY):
+            example = [(0,0),(0,4),(2,6),(4,4),(4,0)]
+            pgon    = polygon.SimplePolygon(list(example), True,
+                                            storage = storage)
+            pgon.enable_incremental()
+            pgon.remove_vertice((2,6))
+            pgon.move_vertice((4,4), (5,5))
+            pgon.insert_vertice((0,4), (-1,2))
+            expected = (pgon.total_signed_area(), pgon.centroid(),
+                        pgon.get_perimeter())
+            pgon.disable_incremental()
+            self.assertAlmostEqual(expected[0], pgon.total_signed_area())
+            self.assertAlmostEqual(expected[1][0], pgon.centroid()[0])
+            self.assertAlmostEqual(expected[1][1], pgon.centroid()[1])
+            self.assertAlmostEqual(expected[2], pgon.get_perimeter())
+
+    def test_checked_edits(self):
+
+        for storage in (polygon.STORAGE_LINKED, polygon.STORAGE_ARRAY):
+            example = [(0,0),(0,4),(2,6),(4,4),(4,0)]
+            pgon    = polygon.SimplePolygon(list(example), True,
+                                            storage = storage)
+            pgon.move_vertice((2,6), (2,8))
+            self.assertEqual(pgon.find_vertice((2,8)).next.coord, (4,4))
+            """ Folding the roof down through the floor """
+            self.assertRaises(ValueError, pgon.move_vertice, (2,8), (2,-2))
+            self.assertTrue(pgon.coordinate_in_polygon((2,8)))
+            """ A spike running back along the neighbouring edge """
+            self.assertRaises(ValueError, pgon.insert_vertice, (0,4), (0,-1))
+            self.assertFalse(pgon.coordinate_in_polygon((0,-1)))
+            pgon.insert_vertice((0,4), (-1,2))
+            pgon.update_vertice((-1,2), (-2,2))
+            self.assertTrue(pgon.polygon_is_simple())
+            self.assertEqual(pgon.vertice_number, 6)
+            self.assertEqual(len(pgon.edge_index), 6)
+            self.assertEqual(sorted(pgon.edge_index.segments.values()),
+                             sorted(tuple(edge) for edge in pgon.get_edges()))
+
+
+class TestArrayStorage(unittest.TestCase):
+
+    examples = TestPolygon.examples
+
+    def make_pair(self, example, clockwise):
+        linked = polygon.SimplePolygon(list(example), clockwise)
+        packed = polygon.SimplePolygon(list(example), clockwise,
+                                       storage = polygon.STORAGE_ARRAY)
+        return linked, packed
+
+    def test_same_ring(self):
+
+        for example in TestArrayStorage.examples:
+            for clockwise in (True, False):
+                linked, packed = self.make_pair(example, clockwise)
+                self.assertEqual(list(linked.ring()), list(packed.ring()))
+                self.assertEqual(linked.get_edges(), packed.get_edges())
+                self.assertEqual(packed.head.next.prev, packed.head)
+
+    def test_same_measures(self):
+
+        for example in TestArrayStorage.examples:
+            for clockwise in (True, False):
+                linked, packed = self.make_pair(example, clockwise)
+                self.assertAlmostEqual(linked.total_signed_area(),
+                                       packed.total_signed_area())
+                self.assertAlmostEqual(linked.get_perimeter(),
+                                       packed.get_perimeter())
+                self.assertEqual(linked.polygon_is_convex(),
+                                 packed.polygon_is_convex())
+
+    def test_remove_vertice(self):
+
+        example = TestArrayStorage.examples[0]
+        for clockwise in (True, False):
+            linked, packed = self.make_pair(example, clockwise)
+            for pgon in (linked, packed):
+                pgon.remove_vertice(example[0])
+            self.assertEqual(list(linked.ring()), list(packed.ring()))
+            self.assertEqual(packed.vertice_number, 3)
+            self.assertRaises(ValueError, packed.remove_vertice, example[1])
+
+    def test_edits_keep_slots(self):
+
+        example = [(0,0),(2,0),(2,2),(1,3),(0,2)]
+        for storage in (polygon.STORAGE_LINKED, polygon.STORAGE_ARRAY):
+            pgon = polygon.SimplePolygon(list(example), storage = storage)
+            pgon.move_vertice((1,3), (1,4))
+            self.assertEqual(pgon.coordinates,
+                             [(0,0),(2,0),(2,2),(1,4),(0,2)])
+        linked, packed = self.make_pair(example, True)
+        packed.find_vertice((2,2))
+        index = dict(packed._vertice_index)
+        for pgon in (linked, packed):
+            pgon.remove_vertice((2,0))
+            pgon.insert_vertice((2,2), (3,1))
+            pgon.remove_vertice((0,0))
+        self.assertEqual(list(linked.ring()), list(packed.ring()))
+        self.assertEqual(linked.coordinates, packed.coordinates)
+        self.assertEqual(packed._vertice_index[(2,2)], index[(2,2)])
+        self.assertEqual(len(packed.buffer), 2*len(example))
+
+
+class TestBulkConstruction(unittest.TestCase):
+
+    def test_detected_orientation(self):
+
+        square = [0,0, 0,1, 1,1, 1,0]
+        for storage in (polygon.STORAGE_LINKED, polygon.STORAGE_ARRAY):
+            pgon_cw  = polygon.SimplePolygon.from_buffer(square,
+                                                         storage = storage)
+            pgon_ccw = polygon.SimplePolygon.from_buffer(
+                           [(0,0),(1,0),(1,1),(0,1)], storage = storage)
+            self.assertTrue(pgon_cw.orientation)
+            self.assertFalse(pgon_ccw.orientation)
+            self.assertTrue(pgon_cw.polygon_is_convex())
+            self.assertTrue(pgon_ccw.polygon_is_convex())
+            self.assertEqual(pgon_ccw.head.next.coord, (1,0))
+
+    def test_buffer_is_shared(self):
+
+        flat = array('d', [0,0, 0,1, 1,1, 1,0])
+        pgon = polygon.SimplePolygon.from_buffer(flat)
+        self.assertFalse(pgon.buffer is flat)
+        flat[0] = -1
+        self.assertEqual(pgon.head.coord, (0,0))
+        pgon = polygon.SimplePolygon.from_buffer(flat, copy = False)
+        self.assertTrue(pgon.buffer is flat)
+
+    def test_setters_invalidate(self):
+
+        for storage in (polygon.STORAGE_LINKED, polygon.STORAGE_ARRAY):
+            pgon = polygon.SimplePolygon([(0,0),(0,1),(1,1),(1,0)], True,
+                                         storage = storage)
+            self.assertAlmostEqual(pgon.total_area(), 1)
+            if storage == polygon.STORAGE_ARRAY:
+                pgon.find_vertice((1,1)).coord = (2,2)
+            else:
+                pgon.move_vertice((1,1), (2,2))
+            self.assertAlmostEqual(pgon.total_area(), 2)
+            self.assertEqual(pgon.find_vertice((2,2)).coord, (2,2))
+            self.assertTrue(pgon.find_vertice((1,1)) is None)
+
+            edges = pgon.get_edges()
+            self.assertTrue(isinstance(edges, tuple))
+            pgon.head = pgon.head.next
+            self.assertEqual(pgon.coordinates[0], (0,1))
+            self.assertEqual(pgon.get_edges()[0][0], (0,1))
+
+            pgon.coordinates = [(0,0),(3,0),(0,3)]
+            self.assertEqual(pgon.vertice_number, 3)
+            self.assertFalse(pgon.orientation)
+            self.assertAlmostEqual(pgon.total_area(), 4.5)
+            self.assertEqual(pgon.find_vertice((3,0)).coord, (3,0))
+
+    def test_validation_levels(self):
+
+        repeated = [0,0, 0,1, 1,1, 0,0]
+        bowtie   = [0,0, 1,1, 1,0, 0,1]
+        self.assertRaises(ValueError, polygon.SimplePolygon.from_buffer,
+                          repeated)
+        polygon.SimplePolygon.from_buffer(repeated,
+                                          validation = polygon.VALIDATE_NONE)
+        polygon.SimplePolygon.from_buffer(bowtie)
+        self.assertRaises(ValueError, polygon.SimplePolygon.from_buffer,
+                          bowtie, polygon.VALIDATE_SIMPLE)
+        self.assertRaises(ValueError, polygon.SimplePolygon.from_buffer,
+                          bowtie, 'everything')
+
+
+class TestTransform(unittest.TestCase):
+
+    square = [(0,0),(0,2),(2,2),(2,0)]
+
+    def assertRingAlmostEqual(self, pgon, expected):
+        for coord, other in zip(pgon.ring(), expected):
+            self.assertAlmostEqual(coord[0], other[0])
+            self.assertAlmostEqual(coord[1], other[1])
+
+    def test_whole_polygon_moves(self):
+
+        for storage in (polygon.STORAGE_LINKED, polygon.STORAGE_ARRAY):
+            pgon = polygon.SimplePolygon(list(TestTransform.square), True,
+                                         storage = storage)
+            self.assertRingAlmostEqual(pgon.translate_polygon((1,-1)),
+                                       [(1,-1),(1,1),(3,1),(3,-1)])
+            self.assertRingAlmostEqual(pgon.scale_polygon(2),
+                                       [(-1,-1),(-1,3),(3,3),(3,-1)])
+            self.assertRingAlmostEqual(pgon.rotate_polygon(90),
+                                       [(2,0),(0,0),(0,2),(2,2)])
+            self.assertEqual(pgon.rotate_polygon(90).storage, storage)
+            self.assertRaises(ValueError, pgon.scale_polygon, 0)
+
+    def test_composed_and_lazy(self):
+
+        pgon    = polygon.SimplePolygon(list(TestTransform.square), False,
+                                        storage = polygon.STORAGE_ARRAY)
+        chain   = (affine.AffineTransform.rotation(math.pi, (1,1))
+                   .then(affine.AffineTransform.scaling(3))
+                   .then(affine.AffineTransform.translation((1,1))))
+        eager   = pgon.transform(chain)
+        lazy    = pgon.transform(chain, lazy = True)
+        stepped = (pgon.rotate_polygon(math.pi, radians = True, lazy = True)
+                   .transform(affine.AffineTransform.scaling(3), lazy = True)
+                   .translate_polygon((1,1), lazy = True))
+
+        self.assertTrue(lazy._pending is not None)
+        self.assertRingAlmostEqual(eager, list(lazy.ring()))
+        self.assertRingAlmostEqual(eager, list(stepped.ring()))
+        self.assertTrue(lazy._pending is None)
+        self.assertAlmostEqual(eager.total_signed_area(),
+                               9*pgon.total_signed_area())
+
+    def test_lazy_shares_and_composes(self):
+
+        for storage in (polygon.STORAGE_LINKED, polygon.STORAGE_ARRAY):
+            pgon  = polygon.SimplePolygon(list(TestTransform.square), True,
+                                          storage = storage)
+            lazy  = pgon.translate_polygon((1,1), lazy = True)
+            twice = lazy.rotate_polygon(90, lazy = True).scale_polygon(
+                        2, lazy = True)
+            self.assertTrue(twice._pending[0] is lazy._pending[0])
+            self.assertTrue(lazy._pending is not None)
+            pgon.move_vertice((2,2), (3,3))
+            self.assertRingAlmostEqual(lazy, [(1,1),(1,3),(3,3),(3,1)])
+            self.assertRingAlmostEqual(twice, [(4,0),(0,0),(0,4),(4,4)])
+            self.assertEqual(pgon.find_vertice((3,3)).coord, (3,3))
+
+    def test_mirror_keeps_orientation_consistent(self):
+
+        pgon   = polygon.SimplePolygon(list(TestTransform.square), True)
+        mirror = pgon.transform(affine.AffineTransform.scaling(-1, 1))
+        self.assertFalse(mirror.orientation)
+        self.assertTrue(mirror.polygon_is_convex())
+        self.assertRaises(ValueError, pgon.transform,
+                          affine.AffineTransform.scaling(1, 0))
+
+
+class TestPredicates(unittest.TestCase):
+
+    """ A U open at the top, its notch the square (2,2)-(4,6) """
+    u_shape = [(0,0),(0,6),(2,6),(2,2),(4,2),(4,6),(6,6),(6,0)]
+
+    def square(self, x, y, size):
+        return polygon.SimplePolygon([(x,y),(x,y+size),(x+size,y+size),
+                                      (x+size,y)], True)
+
+    def test_convex_pairs(self):
+
+        pgon = self.square(0, 0, 2)
+        self.assertFalse(pgon.intersects(self.square(3, 0, 1)))
+        self.assertFalse(pgon.intersects(polygon.SimplePolygon(
+                             [(2,3),(3,3),(3,2)], True)))
+        self.assertTrue(pgon.intersects(self.square(1, 1, 2)))
+        self.assertTrue(pgon.intersects(self.square(2, 0, 1)))
+        self.assertTrue(pgon.intersects(self.square(2, 2, 1)))
+        self.assertTrue(pgon.contains(self.square(0, 0, 1)))
+        self.assertTrue(self.square(0, 0, 1).within(pgon))
+        self.assertFalse(pgon.contains(self.square(1, 1, 2)))
+
+        """ Regular 400-gons of radius 1, apart and overlapping """
+        ring = [(math.cos(k*math.pi/200), math.sin(k*math.pi/200))
+                for k in xrange(400)]
+        disc = polygon.SimplePolygon(ring)
+        for shift, separated in ((2.001, True), (1.999, False)):
+            moved = polygon.SimplePolygon([(x + shift, y) for x, y in ring])
+            self.assertEqual(disc.separated_from(moved), separated)
+
+    def test_concave_pairs(self):
+
+        u_shape = polygon.SimplePolygon(list(TestPredicates.u_shape), True)
+        notch   = self.square(2.5, 3, 1)
+        self.assertFalse(u_shape.intersects(notch))
+        self.assertFalse(u_shape.contains(notch))
+        self.assertTrue(u_shape.intersects(self.square(1.5, 3, 1)))
+        self.assertTrue(u_shape.intersects(self.square(-1, -1, 8)))
+        self.assertTrue(u_shape.within(self.square(-1, -1, 8)))
+        self.assertTrue(u_shape.contains(self.square(0.5, 0.5, 1)))
+        """ Touching the inside of the boundary is still contained """
+        self.assertTrue(u_shape.contains(self.square(0, 0, 2)))
+        self.assertTrue(u_shape.contains(u_shape))
+        """ Every vertice inside, but the top edge spans the notch """
+        bridge = polygon.SimplePolygon([(1,4),(1,5),(5,5),(5,4)], True)
+        self.assertFalse(u_shape.contains(bridge))
+        self.assertTrue(u_shape.intersects(bridge))
+
+    def test_boundary_crossings(self):
+
+        u_shape  = polygon.SimplePolygon(list(TestPredicates.u_shape), True)
+        bar      = polygon.SimplePolygon([(-1,4),(-1,5),(7,5),(7,4)], True)
+        points   = sorted(point for edge, other, point
+                          in u_shape.boundary_crossings(bar))
+        expected = sorted((x, y) for x in (0.0, 2.0, 4.0, 6.0)
+                          for y in (4.0, 5.0))
+        self.assertEqual(points, expected)
+
 if __name__ == '__main__':
     unittest.main()
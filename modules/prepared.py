@@ -0,0 +1,236 @@
+"""
+Prepared Polygon Module for Geometry Package
+
+Point in polygon queries against a polygon that has been indexed
+once, for classifying many points.
+"""
+import bisect
+
+import numpy
+
+import affine
+
+
+""" Codes returned by PreparedPolygon.locate """
+OUTSIDE  = 0
+INSIDE   = 1
+BOUNDARY = 2
+
+
+class PreparedPolygon(object):
+    """
+    Index of the edges of a SimplePolygon for point location.  The
+    distinct vertice ys cut the plane into horizontal slabs, no vertice
+    lying strictly inside one, and a segment tree is built over the
+    slabs: every non-horizontal edge is stored in the O(log n) tree
+    nodes whose slabs together make up its y range, so the index holds
+    O(n log n) entries whatever the shape (a comb has n edges over
+    every slab, which stored slab by slab would be n^2).  The edges
+    stored in a node span all of its slabs without crossing, so they
+    are kept sorted from left to right.
+
+    A query casts a ray to the right: it finds its slab by bisection,
+    walks from that leaf up to the root, and in each node counts the
+    edges right of the point by bisection again, O(log^2 n) in all.
+    Horizontal edges and vertices are checked for the boundary case
+    only.  The polygon is read once; later edits to it are not seen
+    (SimplePolygon.prepare hands out a fresh one after an edit).
+    """
+
+    def __init__(self, polygon):
+        edges = [(a[0], a[1], b[0], b[1]) for a, b in polygon.ring_pairs()]
+
+        self.edge_number = len(edges)
+        self.min_x = min(min(edge[0], edge[2]) for edge in edges)
+        self.max_x = max(max(edge[0], edge[2]) for edge in edges)
+        self.min_y = min(min(edge[1], edge[3]) for edge in edges)
+        self.max_y = max(max(edge[1], edge[3]) for edge in edges)
+
+        """ Slab k runs from ys[k] up to ys[k+1] """
+        self.ys    = sorted(set(edge[1] for edge in edges))
+        slabs      = max(len(self.ys) - 1, 1)
+        self.size  = 1
+        while self.size < slabs:
+            self.size *= 2
+        rank       = dict((y, k) for k, y in enumerate(self.ys))
+
+        """
+        Segment tree, node 1 the root and node size + k the leaf for
+        slab k.  Edges are stored bottom up, oriented upwards.
+        """
+        nodes, flat, keys = {}, [], []
+        for ax, ay, bx, by in edges:
+            if ay == by:
+                """ Horizontal: only ever on the boundary """
+                keys.append((ay, min(ax, bx), max(ax, bx)))
+                continue
+            if ay > by:
+                ax, ay, bx, by = bx, by, ax, ay
+            edge = len(flat)
+            flat.append((ax, ay, bx, by))
+            low, high, height = rank[ay] + self.size, rank[by] + self.size, 0
+            while low < high:
+                if low & 1:
+                    nodes.setdefault(low, (height, []))[1].append(edge)
+                    low += 1
+                if high & 1:
+                    high -= 1
+                    nodes.setdefault(high, (height, []))[1].append(edge)
+                low, high, height = low >> 1, high >> 1, height + 1
+
+        """ Node by node, each node's edges from left to right """
+        order, starts = [], [0]*(2*self.size + 1)
+        for node in xrange(2*self.size):
+            if node in nodes:
+                height, members = nodes[node]
+                first = (node << height) - self.size
+                y     = (self.ys[first] + self.ys[first + 1])/2.0
+                members.sort(key = lambda edge: _x_at(flat[edge], y))
+                order.extend(members)
+            starts[node + 1] = len(order)
+        self.starts = starts
+        self.edges  = [flat[edge] for edge in order]
+
+        """
+        Vertices and horizontal edges as (y, min x, max x), sorted, so
+        that the last key not past (y, x, inf) is the only one that can
+        hold the point (see _on_horizontal).
+        """
+        keys.extend((edge[1], edge[0], edge[0]) for edge in edges)
+        self.keys = sorted(keys)
+
+        self._arrays = None
+
+
+    def _on_horizontal(self, x, y):
+        index = bisect.bisect_right(self.keys, (y, x, float('inf'))) - 1
+        if index < 0:
+            return False
+        key_y, low, high = self.keys[index]
+        return key_y == y and low <= x <= high
+
+
+    def locate(self, point):
+        """
+        Returns INSIDE, OUTSIDE or BOUNDARY for point.  Uses the usual
+        crossing rule: an edge counts if it straddles the horizontal
+        through point (half-open in y, so vertices are not counted
+        twice) and crosses it to the right of point.
+        """
+        x, y = point[0], point[1]
+        if not (self.min_x <= x <= self.max_x and
+                self.min_y <= y <= self.max_y):
+            return OUTSIDE
+        if self._on_horizontal(x, y):
+            return BOUNDARY
+
+        slab = bisect.bisect_right(self.ys, y) - 1
+        if slab >= len(self.ys) - 1:
+            return OUTSIDE
+        edges, starts = self.edges, self.starts
+        inside, node  = False, slab + self.size
+        while node:
+            """ First edge of the node right of the point """
+            low, high = starts[node], starts[node + 1]
+            stop      = high
+            while low < high:
+                middle = (low + high) // 2
+                if _side(edges[middle], x, y) > 0:
+                    high = middle
+                else:
+                    low = middle + 1
+            if low > starts[node] and _side(edges[low - 1], x, y) == 0:
+                return BOUNDARY
+            if (stop - low) & 1:
+                inside = not inside
+            node >>= 1
+        return INSIDE if inside else OUTSIDE
+
+
+    def _get_arrays(self):
+        if self._arrays is None:
+            edges = numpy.array(self.edges, dtype = float).reshape(-1, 4)
+            keys  = numpy.array(self.keys, dtype = float).reshape(-1, 3)
+            self._arrays = (numpy.array(self.starts), edges,
+                            keys, numpy.array(self.ys, dtype = float))
+        return self._arrays
+
+
+    def locate_many(self, points):
+        """
+        Classifies many points given as a flat buffer [x0, y0, ...] or
+        a sequence of (x, y) pairs, returning an ndarray of codes.  The
+        same search as locate, run for every point at once: each step
+        of each bisection is one NumPy operation over all the points.
+        """
+        starts, edges, keys, ys = self._get_arrays()
+        points = affine.as_points(points)
+        x, y   = points[:, 0], points[:, 1]
+        codes  = numpy.zeros(len(points), dtype = numpy.int8)
+        if not len(points):
+            return codes
+
+        """
+        Vertices and horizontal edges, as in _on_horizontal.  NumPy
+        orders complex numbers by real then imaginary part, which
+        makes a lexicographic bisection on (y, x).
+        """
+        index    = numpy.searchsorted(keys[:, 0] + 1j*keys[:, 1],
+                                      y + 1j*x, 'right') - 1
+        found    = keys[numpy.maximum(index, 0)]
+        boundary = ((index >= 0) & (found[:, 0] == y) &
+                    (found[:, 1] <= x) & (x <= found[:, 2]))
+
+        """ Points with nothing to search start from node 0, which is empty """
+        slab   = numpy.searchsorted(ys, y, 'right') - 1
+        search = ((self.min_x <= x) & (x <= self.max_x) &
+                  (0 <= slab) & (slab < len(ys) - 1) & ~boundary)
+        node   = numpy.where(search, slab + self.size, 0)
+        inside = numpy.zeros(len(points), dtype = bool)
+        steps  = int(numpy.diff(starts).max()).bit_length() if len(edges) else 0
+        while node.any():
+            first, stop = starts[node], starts[node + 1]
+            low, high   = first.copy(), stop.copy()
+            for _ in xrange(steps):
+                middle = (low + high) // 2
+                right  = _sides(edges, numpy.minimum(middle, len(edges) - 1),
+                                x, y) > 0
+                active = low < high
+                high   = numpy.where(active & right, middle, high)
+                low    = numpy.where(active & ~right, middle + 1, low)
+            previous  = numpy.maximum(low - 1, 0)
+            boundary |= ((low > first) &
+                         (_sides(edges, previous, x, y) == 0))
+            inside   ^= ((stop - low) & 1).astype(bool)
+            node    >>= 1
+
+        codes[inside]   = INSIDE
+        codes[boundary] = BOUNDARY
+        return codes
+
+
+    def contains(self, point):
+        """ True for points inside the polygon or on its boundary """
+        return self.locate(point) != OUTSIDE
+
+
+    def __repr__(self):
+        return 'Prepared %s-gon' % self.edge_number
+
+
+def _x_at(edge, y):
+    ax, ay, bx, by = edge
+    return ax + (y - ay)*(bx - ax)/(1.0*(by - ay))
+
+
+def _side(edge, x, y):
+    """ Positive if (x, y) is left of the upward edge, 0 if on its line """
+    ax, ay, bx, by = edge
+    return (bx - ax)*(y - ay) - (by - ay)*(x - ax)
+
+
+def _sides(edges, index, x, y):
+    """ _side of every point against the edge at its index """
+    ax, ay, bx, by = edges[index].T
+    return (bx - ax)*(y - ay) - (by - ay)*(x - ax)
+
@@ -0,0 +1,103 @@
+"""
+This file contains test methods for prepared.py.
+"""
+
+import unittest
+import random
+from array import array
+
+import numpy
+
+import prepared
+import polygon
+
+
+
+class TestPreparedPolygon(unittest.TestCase):
+
+    """ Roof dipping to a vertice at (2,2) """
+    roof  = [(0,0),(0,4),(2,2),(4,4),(4,0)]
+    """ Step down then up: horizontal edges at y = 1, 2 and 3 """
+    steps = [(0,0),(0,2),(1,2),(1,1),(3,1),(3,3),(4,3),(4,0)]
+
+    def locate_both(self, index, points):
+        """
+        locate_many's codes (0 outside, 1 inside, 2 on the boundary),
+        checked against locate point by point.
+        """
+        codes = index.locate_many(points).tolist()
+        self.assertEqual(codes, [index.locate(point) for point in points])
+        return codes
+
+    def test_locate(self, trials = 200):
+
+        pgon  = polygon.SimplePolygon(list(TestPreparedPolygon.roof), True)
+        index = pgon.prepare()
+        codes = self.locate_both(index, [(1,1),(2,3),(2,2),(0,1),(5,1),(4,4)])
+        self.assertEqual(codes, [1, 0, 2, 2, 0, 2])
+        self.assertTrue(pgon.prepare() is index)
+
+        """ Inside means above the floor and below both sloping roof edges """
+        for trial in xrange(trials):
+            x, y   = random.uniform(-1, 5), random.uniform(-1, 5)
+            inside = (0 < x < 4 and 0 < y and (y < 4 - x if x < 2 else y < x))
+            if abs(y - (4 - x if x < 2 else x)) > 1e-9:
+                self.assertEqual(index.contains((x,y)), inside)
+
+    def test_slab_boundaries_and_vertices(self):
+
+        index = prepared.PreparedPolygon(polygon.SimplePolygon(
+            TestPreparedPolygon.roof))
+        """ Every vertice, then points at the ys of vertices """
+        codes = self.locate_both(index, TestPreparedPolygon.roof)
+        self.assertEqual(codes, [2]*5)
+        codes = self.locate_both(index, [(-1,2),(1,2),(3,2),(5,2),
+                                         (1,4),(2,4),(3,4),(2,0),(2,-1)])
+        self.assertEqual(codes, [0, 1, 1, 0, 0, 0, 0, 2, 0])
+
+    def test_horizontal_edges(self):
+
+        index = prepared.PreparedPolygon(polygon.SimplePolygon(
+            TestPreparedPolygon.steps))
+        codes = self.locate_both(index, [(0.5,2),(2,1),(3.5,3),(2,0),
+                                         (2,2),(2,3),(-1,2),(5,3),
+                                         (0.5,1),(3.5,2),(3.5,1),(2,0.5)])
+        self.assertEqual(codes, [2]*4 + [0]*4 + [1]*4)
+
+        """ Half unit lattice: every vertice, edge and slab boundary """
+        points = [(x/2.0, y/2.0) for x in xrange(-2, 11)
+                  for y in xrange(-2, 9)]
+        self.locate_both(index, points)
+
+    def test_empty_points(self):
+
+        index = prepared.PreparedPolygon(polygon.SimplePolygon(
+            TestPreparedPolygon.steps))
+        for points in ([], array('d'), numpy.zeros((0, 2))):
+            codes = index.locate_many(points)
+            self.assertEqual(codes.shape, (0,))
+            self.assertEqual(codes.dtype, numpy.int8)
+
+    def test_comb(self, teeth = 200):
+
+        """ Teeth of varying height: every slab crosses most teeth """
+        ring = [(0,0)]
+        for i in xrange(teeth):
+            height = 10 + (i*37) % 101
+            ring  += [(4*i,height),(4*i+1,height),(4*i+1,5),(4*i+3,5)]
+        ring.append((4*teeth,0))
+        index = polygon.SimplePolygon(ring).prepare()
+        self.assertTrue(len(index.edges) < 8*len(ring))
+
+        points = [(random.randint(-2, 4*teeth + 2)/2.0,
+                   random.randint(-2, 230)/2.0) for i in xrange(2000)]
+        self.locate_both(index, points)
+        self.assertEqual(index.locate((4*3 + 0.5, 7)), prepared.INSIDE)
+        self.assertEqual(index.locate((4*3 + 2, 7)), prepared.OUTSIDE)
+        self.assertEqual(index.locate((4*3 + 2, 5)), prepared.BOUNDARY)
+        self.assertEqual(index.locate((4*3 + 1, 7)), prepared.BOUNDARY)
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,173 @@
+"""
+R-tree Module for Geometry Package
+
+A static, bulk loaded R-tree over the bounding boxes of many
+polygons, for finding the polygons near a given one.
+"""
+import heapq
+import math
+from array import array
+
+
+def boxes_overlap(boxA, boxB):
+    """ Boxes are (min_x, min_y, max_x, max_y), touching counts """
+    return (boxA[0] <= boxB[2] and boxB[0] <= boxA[2] and
+            boxA[1] <= boxB[3] and boxB[1] <= boxA[3])
+
+
+def box_distance(box, point):
+    """ Distance from point to the nearest point of box (0 inside) """
+    dx = max(box[0] - point[0], 0, point[0] - box[2])
+    dy = max(box[1] - point[1], 0, point[1] - box[3])
+    return math.sqrt(dx*dx + dy*dy)
+
+
+class PackedRTree(object):
+    """
+    Sort-Tile-Recursive packed R-tree.  The items (polygons, by their
+    bounding boxes) are sorted into vertical slices by box centre x,
+    each slice is sorted by centre y, and runs of node_capacity items
+    become the leaves.  Each level above groups runs of node_capacity
+    consecutive nodes of the level below, up to a single root.  The
+    tree is built in O(N log N) and cannot be changed afterwards.
+
+    Every level is kept as a flat array of boxes, four numbers each.
+    Node j of a level covers nodes j*node_capacity onwards of the
+    level below, so the tree needs no node objects.  Queries return
+    item indices, in terms of the list or collection the tree was
+    built from.
+    """
+
+    def __init__(self, boxes, node_capacity = 16, items = None):
+        """
+        boxes is a flat buffer [min_x, min_y, max_x, max_y, ...] with
+        one box per item.  items, if given, is what item() hands back.
+        """
+        if node_capacity < 2:
+            raise ValueError('Nodes need room for at least two children')
+
+        self.node_capacity = node_capacity
+        self.items         = items
+        self.size          = len(boxes) // 4
+        self.order         = self.str_order(boxes, self.size, node_capacity)
+
+        """ Level 0 holds the item boxes in packed order """
+        leaves = array('d')
+        for index in self.order:
+            leaves.extend(boxes[4*index:4*index+4])
+        self.levels = [leaves]
+        while len(self.levels[-1]) > 4:
+            self.levels.append(self.group(self.levels[-1]))
+
+
+    @classmethod
+    def from_polygons(cls, polygons, node_capacity = 16):
+        boxes = array('d')
+        for pgon in polygons:
+            boxes.extend(pgon.bounding_box())
+        return cls(boxes, node_capacity, polygons)
+
+
+    @classmethod
+    def from_collection(cls, collection, node_capacity = 16):
+        return cls(collection.bounding_boxes(), node_capacity, collection)
+
+
+    @staticmethod
+    def str_order(boxes, size, node_capacity):
+        """ Item indices in Sort-Tile-Recursive order """
+        centre    = lambda i, axis: boxes[4*i+axis] + boxes[4*i+axis+2]
+        leaves    = int(math.ceil(1.0*size/node_capacity))
+        slices    = int(math.ceil(math.sqrt(leaves)))
+        per_slice = max(slices*node_capacity, 1)
+
+        by_x  = sorted(xrange(size), key = lambda i: centre(i, 0))
+        order = array('l')
+        for start in xrange(0, size, per_slice):
+            order.extend(sorted(by_x[start:start+per_slice],
+                                key = lambda i: centre(i, 1)))
+        return order
+
+
+    def group(self, boxes):
+        """ Boxes of the level above boxes, one per node_capacity run """
+        step   = 4*self.node_capacity
+        parent = array('d')
+        for start in xrange(0, len(boxes), step):
+            run = boxes[start:start+step]
+            parent.extend((min(run[0::4]), min(run[1::4]),
+                           max(run[2::4]), max(run[3::4])))
+        return parent
+
+
+    def box(self, level, index):
+        return self.levels[level][4*index:4*index+4]
+
+
+    def children(self, level, index):
+        """ Indices in level - 1 of the children of node index """
+        first = index*self.node_capacity
+        last  = min(first + self.node_capacity, len(self.levels[level-1]) // 4)
+        return xrange(first, last)
+
+
+    def item(self, index):
+        return self.items[index]
+
+    """ The following are the queries """
+
+    def window(self, box):
+        """ Indices of the items whose boxes overlap box """
+        found = []
+        if not self.size:
+            return found
+        stack = [(len(self.levels) - 1, 0)]
+        while stack:
+            level, index = stack.pop()
+            if not boxes_overlap(self.box(level, index), box):
+                continue
+            if level == 0:
+                found.append(self.order[index])
+            else:
+                stack.extend((level - 1, child)
+                             for child in self.children(level, index))
+        return found
+
+
+    def intersects_candidates(self, polygon):
+        """
+        Indices of the items whose boxes overlap the bounding box of
+        polygon, the only ones that can touch or overlap it (including
+        polygon itself, if it is one of the items).
+        """
+        return self.window(polygon.bounding_box())
+
+
+    def nearest(self, point, k = 1):
+        """
+        Indices of the k items whose boxes are closest to point, closest
+        first.  Best-first search: nodes come off a heap ordered by box
+        distance, so only nodes nearer than the k-th answer are opened.
+        """
+        found = []
+        if not self.size:
+            return found
+        top  = len(self.levels) - 1
+        heap = [(box_distance(self.box(top, 0), point), top, 0)]
+        while heap and len(found) < k:
+            distance, level, index = heapq.heappop(heap)
+            if level == 0:
+                found.append(self.order[index])
+                continue
+            for child in self.children(level, index):
+                heapq.heappush(heap, (box_distance(self.box(level - 1, child),
+                                                   point), level - 1, child))
+        return found
+
+
+    def __len__(self):
+        return self.size
+
+    def __repr__(self):
+        return 'Packed R-tree of %s items, %s levels' % (self.size,
+                                                         len(self.levels))
@@ -0,0 +1,64 @@
+"""
+This file contains test methods for rtree.py.
+"""
+
+import unittest
+import random
+
+import rtree
+import polygon
+import collection
+
+
+
+class TestPackedRTree(unittest.TestCase):
+
+    def random_squares(self, number):
+        squares = []
+        for i in xrange(number):
+            x, y, size = (random.uniform(0, 100), random.uniform(0, 100),
+                          random.uniform(0.5, 5))
+            squares.append([(x,y),(x,y+size),(x+size,y+size),(x+size,y)])
+        return squares
+
+    def test_window(self, trials = 20):
+
+        squares  = self.random_squares(300)
+        polygons = [polygon.SimplePolygon(square, True) for square in squares]
+        tree     = rtree.PackedRTree.from_polygons(polygons, 8)
+        for trial in xrange(trials):
+            x, y = random.uniform(0, 100), random.uniform(0, 100)
+            box  = (x, y, x + random.uniform(0, 20), y + random.uniform(0, 20))
+            expected = [i for i, pgon in enumerate(polygons)
+                        if rtree.boxes_overlap(pgon.bounding_box(), box)]
+            self.assertEqual(sorted(tree.window(box)), expected)
+
+        candidates = tree.intersects_candidates(polygons[0])
+        self.assertTrue(0 in candidates)
+        self.assertTrue(tree.item(candidates[0]) in polygons)
+
+    def test_nearest(self, trials = 20):
+
+        pgons = collection.PolygonCollection(self.random_squares(200))
+        tree  = rtree.PackedRTree.from_collection(pgons)
+        boxes = pgons.bounding_boxes()
+        for trial in xrange(trials):
+            point     = (random.uniform(-10, 110), random.uniform(-10, 110))
+            distances = sorted(rtree.box_distance(boxes[4*i:4*i+4], point)
+                               for i in xrange(len(pgons)))
+            found     = tree.nearest(point, 5)
+            self.assertEqual(len(found), 5)
+            for index, distance in zip(found, distances):
+                self.assertAlmostEqual(
+                    rtree.box_distance(boxes[4*index:4*index+4], point),
+                    distance)
+
+    def test_small_trees(self):
+
+        self.assertEqual(rtree.PackedRTree([]).window((0,0,1,1)), [])
+        tree = rtree.PackedRTree([0,0,1,1])
+        self.assertEqual(tree.window((1,1,2,2)), [0])
+        self.assertEqual(tree.nearest((5,5), 3), [0])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+"""
+Segment Grid Module for Geometry Package
+
+A uniform grid (spatial hash) of line segments, used to find the
+segments lying near a given one without looking at all of them.
+"""
+import math
+
+
+class SegmentGrid(object):
+    """
+    Buckets line segments of form [(x1,y1), (x2,y2)] by the square
+    cells of side cell_size that their bounding boxes cover.  Every
+    segment is stored under a hashable key chosen by the caller, so
+    segments can be removed or replaced one at a time.  Only occupied
+    cells are kept (in a dictionary), so the grid is unbounded.
+    """
+
+    def __init__(self, cell_size):
+        if not cell_size > 0:
+            raise ValueError('Cell size must be positive')
+
+        self.cell_size = 1.0*cell_size
+        self.cells     = {}
+        self.segments  = {}
+
+
+    @staticmethod
+    def cell_size_for(segments):
+        """
+        A cell size suited to segments: their mean length, so that a
+        typical segment covers a handful of cells.  Falls back to 1.0
+        when every segment is a point.
+        """
+        total = count = 0
+        for segment in segments:
+            total += math.sqrt((segment[1][0] - segment[0][0])**2 +
+                               (segment[1][1] - segment[0][1])**2)
+            count += 1
+        return total/count if count and total > 0 else 1.0
+
+
+    def cell_of(self, coordinate):
+        return (int(math.floor(coordinate[0]/self.cell_size)),
+                int(math.floor(coordinate[1]/self.cell_size)))
+
+
+    def cells_of(self, segment):
+        """
+        Cells that segment passes through.  Walks the columns between
+        its endpoints and takes the rows the segment spans inside each
+        one, so a long diagonal costs cells in proportion to its length
+        rather than to its bounding box.  Row bounds are widened by a
+        hair so that rounding never loses a cell the segment touches.
+        """
+        size   = self.cell_size
+        (x1, y1), (x2, y2) = sorted((segment[0], segment[1]))
+        first  = int(math.floor(x1/size))
+        last   = int(math.floor(x2/size))
+        cells  = []
+        for i in xrange(first, last + 1):
+            if x1 == x2:
+                low, high = min(y1, y2), max(y1, y2)
+            else:
+                left  = max(x1, i*size)
+                right = min(x2, (i + 1)*size)
+                slope = (y2 - y1)/(1.0*(x2 - x1))
+                ends  = (y1 + slope*(left - x1), y1 + slope*(right - x1))
+                low, high = min(ends), max(ends)
+            for j in xrange(int(math.floor(low/size - 1e-9)),
+                            int(math.floor(high/size + 1e-9)) + 1):
+                cells.append((i, j))
+        return cells
+
+
+    def insert(self, key, segment):
+        """ Adds segment under key, replacing whatever key held before """
+        if key in self.segments:
+            self.remove(key)
+        self.segments[key] = segment
+        for cell in self.cells_of(segment):
+            self.cells.setdefault(cell, set()).add(key)
+
+
+    def remove(self, key):
+        segment = self.segments.pop(key)
+        for cell in self.cells_of(segment):
+            bucket = self.cells[cell]
+            bucket.discard(key)
+            if not bucket:
+                del self.cells[cell]
+        return segment
+
+
+    def segment(self, key):
+        return self.segments[key]
+
+
+    def candidates(self, segment):
+        """
+        Keys of every stored segment sharing a cell with segment.  Any
+        segment that touches segment is among them, along with some
+        that only come close.
+        """
+        found = set()
+        for cell in self.cells_of(segment):
+            bucket = self.cells.get(cell)
+            if bucket:
+                found.update(bucket)
+        return found
+
+
+    def window(self, box):
+        """
+        Keys of every stored segment sharing a cell with the box
+        (min_x, min_y, max_x, max_y).  Walks the cells of the box, or
+        the occupied cells if there are fewer of those.
+        """
+        (i_low, j_low), (i_high, j_high) = self.cell_of(box[:2]), self.cell_of(box[2:])
+        found = set()
+        if (i_high - i_low + 1)*(j_high - j_low + 1) <= len(self.cells):
+            for i in xrange(i_low, i_high + 1):
+                for j in xrange(j_low, j_high + 1):
+                    bucket = self.cells.get((i, j))
+                    if bucket:
+                        found.update(bucket)
+        else:
+            for (i, j), bucket in self.cells.iteritems():
+                if i_low <= i <= i_high and j_low <= j <= j_high:
+                    found.update(bucket)
+        return found
+
+
+    def __contains__(self, key):
+        return key in self.segments
+
+    def __len__(self):
+        return len(self.segments)
+
+    def __repr__(self):
+        return 'Grid of %s segments in %s cells' % (len(self.segments),
+                                                    len(self.cells))
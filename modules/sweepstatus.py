@@ -0,0 +1,177 @@
+"""
+Sweep Status Module for Geometry Package
+
+The ordered set of active segments kept by the sweep-line
+algorithms in lineintersection.py.
+"""
+import random
+
+
+class StatusNode(object):
+
+    __slots__ = ('item', 'priority', 'left', 'right', 'parent')
+
+    def __init__(self, item, priority):
+        self.item     = item
+        self.priority = priority
+        self.left     = None
+        self.right    = None
+        self.parent   = None
+
+    def __repr__(self):
+        return 'Status node holding %r' % (self.item,)
+
+
+class SweepStatus(object):
+    """
+    Balanced binary search tree (a treap: search tree on the items,
+    heap on random priorities) of the segments crossing the sweep line,
+    in order from bottom to top.  The order of segments changes as the
+    sweep moves, so there is no fixed key: insert takes a comparison
+    valid at the current sweep position, and everything else works on
+    the node handles insert returns, using parent pointers, without
+    comparing anything.  Insert and remove are O(log n) expected,
+    neighbours O(log n) worst and O(1) on average.
+    """
+
+    def __init__(self):
+        self.root = None
+        self.size = 0
+
+
+    def insert(self, item, compare):
+        """
+        Adds item, placed by compare(item, other) which must return a
+        negative number if item lies below other and positive if above.
+        Returns the node holding item.
+        """
+        node = StatusNode(item, random.random())
+        self.size += 1
+        if self.root is None:
+            self.root = node
+            return node
+
+        cursor = self.root
+        while True:
+            if compare(item, cursor.item) < 0:
+                if cursor.left is None:
+                    cursor.left = node
+                    break
+                cursor = cursor.left
+            else:
+                if cursor.right is None:
+                    cursor.right = node
+                    break
+                cursor = cursor.right
+        node.parent = cursor
+        """ Restoring the heap order on priorities """
+        while node.parent is not None and node.priority < node.parent.priority:
+            self._rotate_up(node)
+        return node
+
+
+    def remove(self, node):
+        """ Removes node, rotating it down to a leaf first """
+        while node.left is not None and node.right is not None:
+            if node.left.priority < node.right.priority:
+                self._rotate_up(node.left)
+            else:
+                self._rotate_up(node.right)
+
+        child  = node.left if node.left is not None else node.right
+        parent = node.parent
+        if child is not None:
+            child.parent = parent
+        if parent is None:
+            self.root = child
+        elif parent.left is node:
+            parent.left = child
+        else:
+            parent.right = child
+        node.parent = node.left = node.right = None
+        self.size -= 1
+
+
+    def _rotate_up(self, node):
+        """ Rotates node above its parent, keeping the in-order sequence """
+        parent = node.parent
+        grand  = parent.parent
+        if parent.left is node:
+            parent.left = node.right
+            if node.right is not None:
+                node.right.parent = parent
+            node.right = parent
+        else:
+            parent.right = node.left
+            if node.left is not None:
+                node.left.parent = parent
+            node.left = parent
+        parent.parent = node
+        node.parent   = grand
+        if grand is None:
+            self.root = node
+        elif grand.left is parent:
+            grand.left = node
+        else:
+            grand.right = node
+
+    """ The following walk the tree in order """
+
+    def successor(self, node):
+        """ Node directly above node, or None """
+        if node.right is not None:
+            node = node.right
+            while node.left is not None:
+                node = node.left
+            return node
+        while node.parent is not None and node.parent.right is node:
+            node = node.parent
+        return node.parent
+
+
+    def predecessor(self, node):
+        """ Node directly below node, or None """
+        if node.left is not None:
+            node = node.left
+            while node.right is not None:
+                node = node.right
+            return node
+        while node.parent is not None and node.parent.left is node:
+            node = node.parent
+        return node.parent
+
+
+    def last_below(self, below):
+        """
+        Node of the topmost item for which below(item) is true, or
+        None.  below must be true for every item under some position
+        and false for every item above it, as for a point on the sweep
+        line and the segments passing under it.
+        """
+        node, found = self.root, None
+        while node is not None:
+            if below(node.item):
+                found, node = node, node.right
+            else:
+                node = node.left
+        return found
+
+
+    def first(self):
+        node = self.root
+        while node is not None and node.left is not None:
+            node = node.left
+        return node
+
+
+    def __iter__(self):
+        node = self.first()
+        while node is not None:
+            yield node.item
+            node = self.successor(node)
+
+    def __len__(self):
+        return self.size
+
+    def __repr__(self):
+        return 'Sweep status of %s segments' % self.size
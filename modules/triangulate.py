@@ -1,12 +1,30 @@
 """
 Triangulate Module for Geometry Package
 
-Things to do:
-add unit tests
+Breaks simple polygons into triangles, by ear clipping or by a
+monotone partition.
 """
 import math
+import heapq
+import ctypes
+from array import array
+from fractions import Fraction
 
 import polygon
+import segmentgrid
+import sweepstatus
+import lineintersection
+
+
+""" Triangulation engines, see Triangulate """
+ENGINE_EAR      = 'ear'
+ENGINE_MONOTONE = 'monotone'
+
+""" Typecode of 32 bit integers, for the vertice indices of a mesh """
+INDEX_TYPECODE = 'i' if array('i').itemsize == 4 else 'l'
+
+""" Vertice kinds of the monotone partition sweep """
+START, END, SPLIT, MERGE, REGULAR = range(5)
 
 
 class Triangulate(object):
@@ -14,29 +32,43 @@ class Triangulate(object):
     """
     Triangulate Class is used for producing a triangulation
     of a simple polygon using Polygon Class.  This is done
-    using the 'ear-clipping algorithm'.
+    using the 'ear-clipping algorithm' (ENGINE_EAR), or with
+    ENGINE_MONOTONE by splitting the polygon into y-monotone
+    pieces and triangulating each of those, which is
+    O(n log n) whatever the shape.  Convex polygons skip
+    both for a fan from the head vertice, and
+    self.convex_fast_path tells whether that happened.
     """
     """
-    Warning:
-            Algorithm reduces original polygon set as it
-            finds 'ears', so will have to reset it using
-            a method if original polygon is required after
-            triangulation.
+    The polygon is only read: the engines work on a ring
+    of indices of their own, so it can be used, or
+    triangulated again, afterwards as it was.
     """
     """ Can initialize with coordinates or a polygon """
     """ To initialize with polygon use Triangulate([], polygon) """
 
-    def __init__(self, coordinates, polygon = None):
+    def __init__(self, coordinates, polygon = None, engine = ENGINE_EAR):
+
+        if engine not in (ENGINE_EAR, ENGINE_MONOTONE):
+            raise ValueError('Unknown engine %r' % (engine,))
 
         self.coordinates   = polygon.coordinates if polygon else coordinates
-        self.polygon       = polygon if polygon else polygon.SimplePolygon(coordinates)
+        self.polygon       = polygon if polygon else _simple_polygon(coordinates)
+        self.engine        = engine
         self.triangulation = []
+        """ Whether the last triangulate was a convex fan, see fan """
+        self.convex_fast_path = None
+        """ Edge flips made by the last delaunay """
+        self.flips            = None
 
 
     def reset(self):
-        """ Resets to a clockwise orientation using coordinate data."""
-        self.triangulation = []
-        self.polygon       = polygon.SimplePolygon(self.coordinates, True)
+        """
+        Clears the triangulation so that triangulate can run again.
+        The polygon is left untouched by triangulating, so it is kept.
+        """
+        self.triangulation    = []
+        self.convex_fast_path = None
 
     """ The following are helper functions for triangulation """
 
@@ -83,7 +115,7 @@ class Triangulate(object):
         """
         converted_coord = self.convert_to_barycentric(triangle, coordinate)
         for z_i in converted_coord:
-            if z_i <= 0.0 or i >= 1.0:
+            if z_i <= 0.0 or z_i >= 1.0:
                 return False
         return True
 
@@ -97,7 +129,7 @@ class Triangulate(object):
         for z_i in converted_coord:
             if z_i < 0.0 or z_i > 1.0:
                 return False
-            if i == 0 or i == 1:
+            if z_i == 0 or z_i == 1:
                 border_switch = True
         return border_switch
 
@@ -109,15 +141,39 @@ class Triangulate(object):
         return pgon_A.share_edge(pgon_B)
 
 
-    def no_concave_vertices_in(self, triangle):
+    def no_concave_vertices_in(self, triangle, reflex = None):
         """
         Draws from self.polygon.concave, so all_convex_vertices from Polygon
-        must be called first for meaningful result.
+        must be called first for meaningful result, unless a SegmentGrid
+        of the concave vertices is given as reflex, in which case only
+        those in the cells around the triangle are tested.  A concave
+        vertice on the border of the triangle (on the diagonal that
+        would be cut) spoils the ear too.
         """
-        for vertice_coord in self.polygon.concave_vertices:
-            if self.is_coord_in_triangle(self, triangle, vertice_coord):
-                return False
-        return True
+        return self.concave_vertice_in(triangle, reflex) is None
+
+
+    def concave_vertice_in(self, triangle, reflex = None):
+        """
+        As no_concave_vertices_in, returning the first concave vertice
+        found in the triangle, or None.
+        """
+        if reflex is None:
+            candidates = self.polygon.concave_vertices
+        else:
+            xs, ys     = zip(*triangle)
+            candidates = reflex.window((min(xs), min(ys), max(xs), max(ys)))
+
+        a, b, c = triangle
+        sign    = lineintersection.orientation(a, b, c)
+        for vertice_coord in candidates:
+            if vertice_coord in (a, b, c):
+                continue
+            if (lineintersection.orientation(a, b, vertice_coord) != -sign and
+                lineintersection.orientation(b, c, vertice_coord) != -sign and
+                lineintersection.orientation(c, a, vertice_coord) != -sign):
+                return vertice_coord
+        return None
 
 
     def find_ear(self):
@@ -149,20 +205,568 @@ class Triangulate(object):
 
     def triangulate(self):
         """
-        Culmination of all of the helper functions, triangulate uses the
-        'ear-clipping' algorithm to break apart a simple polygon into
-        triangles.
+        Culmination of all of the helper functions, triangulate breaks
+        apart a simple polygon into triangles with self.engine.  Either
+        way a triangle is a list of three coordinates running the same
+        way round as the polygon.
         """
         if self.triangulation:
             raise ValueError('Already triangulated')
 
-        while self.polygon.vertice_number >= 3:
-            ear = self.find_ear()
-            self.triangulation.append(ear[0])
-            self.polygon.remove_vertice(ear[1])
-
+        coords, indices = self.triangle_indices()
+        self.triangulation = [[coords[indices[k]], coords[indices[k+1]],
+                               coords[indices[k+2]]]
+                              for k in xrange(0, len(indices), 3)]
         return self.triangulation
 
 
+    def mesh(self):
+        """
+        The triangulation as a TriangleMesh: the polygon's vertices
+        stored once, with the triangles as triples of their indices,
+        and no coordinates copied per triangle.
+        """
+        coords, indices = self.triangle_indices()
+        return TriangleMesh(polygon.flatten_coordinates(coords), indices)
+
+
+    def delaunay(self):
+        """
+        mesh, improved by edge flips until it is the constrained
+        Delaunay triangulation of the polygon (see
+        TriangleMesh.make_delaunay), which avoids slivers as far as the
+        polygon allows.  The number of flips is kept in self.flips and
+        the resulting shapes are in the mesh's quality.
+        """
+        mesh       = self.mesh()
+        self.flips = mesh.make_delaunay()
+        return mesh
+
+
+    def triangle_indices(self):
+        """
+        Runs the engine (or the convex fast path) over the polygon's
+        vertices, in ring order from its head.  Returns the vertices
+        and an array of indices into them, three per triangle.
+        """
+        coords = list(self.polygon.ring())
+        self.convex_fast_path = self.polygon.polygon_is_convex()
+        if self.convex_fast_path:
+            return coords, self.fan(coords)
+        if self.engine == ENGINE_MONOTONE:
+            return coords, self.monotone_triangulation(coords)
+        return coords, self.clip_ears(coords)
+
+
+    def fan(self, coords):
+        """
+        Triangles from the first of coords to every other edge, in
+        O(n), which is a triangulation of a convex polygon.
+        """
+        indices = array(INDEX_TYPECODE)
+        for i in xrange(1, len(coords) - 1):
+            indices.extend((0, i, i + 1))
+        return indices
+
+
+    def clip_ears(self, coords):
+        """
+        The 'ear-clipping' algorithm over the polygon's vertices coords,
+        the tip of every triangle being in the middle as in
+        triangle_by_ear_tip.
+        """
+        """
+        The vertices are classified once.  Convex ones wait in a heap
+        of ear candidates and concave (reflex) ones are kept in a grid,
+        so an ear is only tested against the reflex vertices near it.
+        Straight vertices (180 degrees) are left out of both: the rows
+        of them left behind by clipping, as along a comb, would
+        otherwise fill the grid under every long ear.  One inside an
+        ear's triangle, or on its diagonal with the boundary crossing
+        or leaving the diagonal there, means a reflex vertice is in the
+        triangle too.  That leaves a straight run along the diagonal
+        from one of its ends, which shows in the ring neighbours of
+        that end (see _runs_along).
+        Clipping an ear only changes the angles at its two neighbours,
+        and only by making them sharper, so those two are the only ones
+        reclassified: a reflex one may turn convex and leave the grid,
+        and a convex one goes back in the heap with its new triangle.
+        Ears with the shortest diagonal come first, which keeps the
+        triangles (and so the grid cells searched) small.  An entry
+        whose tip has been clipped, or whose neighbours have changed
+        since, is skipped.  An ear spoilt by a reflex vertice waits on
+        that vertice (in blocked), and goes back in the heap when the
+        vertice turns convex and leaves the grid, so no ear is lost and
+        none is retested before something has changed around it.
+        Should the heap still run dry, every convex vertice is pushed
+        once more; a polygon that yields no ear from a full pass isn't
+        simple.
+        """
+        """
+        Clipping happens on a ring of indices into coords: following
+        and previous hold the neighbours of every vertice still in it,
+        so a clip is two assignments and the polygon itself is never
+        edited.
+        """
+        pgon      = self.polygon
+        n         = len(coords)
+        following = array('l', range(1, n) + [0])
+        previous  = array('l', [n - 1] + range(n - 1))
+        convex    = [pgon.coords_are_convex(coords[i-1], coords[i], coords[(i+1) % n])
+                     for i in xrange(n)]
+
+        """ Cells sized to hold about one reflex vertice each """
+        min_x, min_y, max_x, max_y = pgon.bounding_box()
+        spread = math.sqrt((max_x - min_x)*(max_y - min_y)/
+                           max(convex.count(False), 1))
+        reflex = segmentgrid.SegmentGrid(spread or 1.0)
+        for i in xrange(n):
+            if not convex[i] and lineintersection.orientation(
+                    coords[i-1], coords[i], coords[(i+1) % n]):
+                reflex.insert(coords[i], (coords[i], coords[i]))
+        heap    = [_ear_entry(coords, previous[i], i, following[i])
+                   for i in xrange(n) if convex[i]]
+        heapq.heapify(heap)
+        blocked = {}
+        indices = array(INDEX_TYPECODE)
+        clipped = [False]*n
+        left    = n
+        cursor  = 0
+        retried = False
+
+        while left > 3:
+            if not heap:
+                if retried:
+                    raise ValueError('Polygon is not simple as no ear was found')
+                for _ in xrange(left):
+                    if pgon.coords_are_convex(coords[previous[cursor]],
+                                              coords[cursor],
+                                              coords[following[cursor]]):
+                        heap.append(_ear_entry(coords, previous[cursor], cursor,
+                                               following[cursor]))
+                    cursor = following[cursor]
+                heapq.heapify(heap)
+                retried = True
+                continue
+
+            _, prev, tip, following_tip = heapq.heappop(heap)
+            triangle = [coords[prev], coords[tip], coords[following_tip]]
+            if (clipped[tip] or previous[tip] != prev or
+                following[tip] != following_tip or
+                not pgon.coords_are_convex(*triangle)):
+                continue
+            if (_runs_along(coords[previous[prev]], triangle[0], triangle[2]) or
+                _runs_along(coords[following[following_tip]], triangle[2],
+                            triangle[0])):
+                continue
+            blocker = self.concave_vertice_in(triangle, reflex)
+            if blocker is not None:
+                blocked.setdefault(blocker, []).append(tip)
+                continue
+
+            indices.extend((prev, tip, following_tip))
+            clipped[tip]            = True
+            following[prev]         = following_tip
+            previous[following_tip] = prev
+            left   -= 1
+            retried = False
+            for i in (prev, following_tip):
+                corner = (coords[previous[i]], coords[i], coords[following[i]])
+                ear    = pgon.coords_are_convex(*corner)
+                if coords[i] in reflex and (
+                        ear or not lineintersection.orientation(*corner)):
+                    """ No longer reflex: the ears it spoilt may be ears now """
+                    reflex.remove(coords[i])
+                    for j in blocked.pop(coords[i], ()):
+                        if not clipped[j]:
+                            heapq.heappush(heap, _ear_entry(
+                                coords, previous[j], j, following[j]))
+                if ear:
+                    heapq.heappush(heap, _ear_entry(coords, previous[i], i,
+                                                    following[i]))
+            cursor = prev
+
+        indices.extend((previous[cursor], cursor, following[cursor]))
+        return indices
+
+
+    """ The following make up the monotone engine """
+
+    def monotone_triangulation(self, coords):
+        """
+        Splits the polygon with vertices coords into y-monotone pieces
+        (monotone_pieces) and triangulates each in linear time
+        (triangulate_monotone), which is O(n log n) in all.
+        """
+        """ The sweep wants the vertices counter-clockwise """
+        n       = len(coords)
+        flipped = bool(self.polygon.orientation)
+        ccw     = coords[::-1] if flipped else coords
+        keys    = [_sweep_key(coord) for coord in ccw]
+
+        indices = array(INDEX_TYPECODE)
+        for piece in self.monotone_pieces(ccw, keys):
+            for a, b, c in self.triangulate_monotone(ccw, keys, piece):
+                if lineintersection.orientation(ccw[a], ccw[b], ccw[c]) < 0:
+                    a, c = c, a
+                if flipped:
+                    a, b, c = n - 1 - c, n - 1 - b, n - 1 - a
+                indices.extend((a, b, c))
+        return indices
+
+
+    def monotone_pieces(self, coords, keys):
+        """
+        Splits the polygon with coordinates coords, counter-clockwise,
+        into y-monotone pieces by a sweep from top to bottom (see de
+        Berg et al., Computational Geometry, chapter 3), keys being the
+        coordinates' _sweep_keys.  Every split and merge vertice gets a
+        diagonal, to the 'helper' of the edge left of it.  Returns the
+        pieces as lists of indices into coords, counter-clockwise.
+        """
+        n     = len(coords)
+        kinds = []
+        for i in xrange(n):
+            prev, following = (i - 1) % n, (i + 1) % n
+            convex = lineintersection.orientation(coords[prev], coords[i],
+                                                  coords[following]) > 0
+            if keys[prev] > keys[i] and keys[following] > keys[i]:
+                kinds.append(START if convex else SPLIT)
+            elif keys[prev] < keys[i] and keys[following] < keys[i]:
+                kinds.append(END if convex else MERGE)
+            else:
+                kinds.append(REGULAR)
+
+        """
+        The status holds the edges, by the index of their upper end,
+        that have the inside of the polygon on their right (east).
+        """
+        left_of   = lambda edge, coord: lineintersection.orientation(
+                        coords[edge], coords[(edge + 1) % n], coord) > 0
+        status    = sweepstatus.SweepStatus()
+        nodes     = {}
+        helper    = {}
+        diagonals = []
+        for i in sorted(xrange(n), key = keys.__getitem__):
+            coord, kind, prev = coords[i], kinds[i], (i - 1) % n
+            descending = kind == REGULAR and keys[prev] < keys[i]
+            if kind in (END, MERGE) or descending:
+                """ The edge from prev ends here """
+                if kinds[helper[prev]] == MERGE:
+                    diagonals.append((i, helper[prev]))
+                status.remove(nodes.pop(prev))
+            if kind in (SPLIT, MERGE) or (kind == REGULAR and not descending):
+                """ This is the new helper of the edge left of here """
+                node = status.last_below(lambda edge: left_of(edge, coord))
+                if node is None:
+                    raise ValueError('Polygon is not simple')
+                if kind == SPLIT or kinds[helper[node.item]] == MERGE:
+                    diagonals.append((i, helper[node.item]))
+                helper[node.item] = i
+            if kind in (START, SPLIT) or descending:
+                nodes[i]  = status.insert(
+                                i, lambda edge, other: 1 if left_of(other, coord) else -1)
+                helper[i] = i
+
+        """
+        The pieces are the faces of the polygon cut by the diagonals.
+        Each vertice's neighbours are sorted counter-clockwise, and a
+        face is walked by leaving every vertice along the neighbour just
+        clockwise of the one it was entered from.  The outside is made
+        up of the edges walked backwards, so those are never started on.
+        """
+        neighbours = [[(i - 1) % n, (i + 1) % n] for i in xrange(n)]
+        for a, b in diagonals:
+            neighbours[a].append(b)
+            neighbours[b].append(a)
+        for i in xrange(n):
+            x, y = coords[i]
+            neighbours[i].sort(key = lambda j: math.atan2(coords[j][1] - y,
+                                                          coords[j][0] - x))
+        walked = set((i, (i - 1) % n) for i in xrange(n))
+        pieces = []
+        for start in xrange(n):
+            for end in neighbours[start]:
+                a, b  = start, end
+                piece = []
+                while (a, b) not in walked:
+                    walked.add((a, b))
+                    piece.append(a)
+                    around = neighbours[b]
+                    a, b   = b, around[around.index(a) - 1]
+                if piece:
+                    pieces.append(piece)
+        return pieces
+
+
+    def triangulate_monotone(self, coords, keys, piece):
+        """
+        Triangles (as index triples) of a y-monotone piece, given as in
+        monotone_pieces.  Its two chains are merged into sweep order and
+        walked once, keeping a stack of vertices still to be joined to
+        the chain opposite (see de Berg et al.).
+        """
+        k      = len(piece)
+        top    = min(xrange(k), key = lambda m: keys[piece[m]])
+        bottom = max(xrange(k), key = lambda m: keys[piece[m]])
+        """ Counter-clockwise from the top is down the left chain """
+        left   = [piece[(top + m) % k] for m in xrange((bottom - top) % k)]
+        right  = [piece[(top - m) % k] for m in xrange(1, (top - bottom) % k + 1)]
+        order  = [i for key, i in heapq.merge([(keys[i], i) for i in left],
+                                              [(keys[i], i) for i in right])]
+        on_left = set(left)
+
+        triangles = []
+        stack     = order[:2]
+        for current in order[2:-1]:
+            if (current in on_left) != (stack[-1] in on_left):
+                for m in xrange(len(stack) - 1):
+                    triangles.append((current, stack[m], stack[m+1]))
+                stack = [stack[-1], current]
+                continue
+            """
+            Same chain: cut off the stacked vertices that make a convex
+            corner with current, down the left chain counter-clockwise
+            and down the right one clockwise.
+            """
+            sign = 1 if current in on_left else -1
+            last = stack.pop()
+            while stack and sign*lineintersection.orientation(
+                      coords[stack[-1]], coords[last], coords[current]) > 0:
+                triangles.append((current, last, stack[-1]))
+                last = stack.pop()
+            stack.extend((last, current))
+        for m in xrange(len(stack) - 1):
+            triangles.append((order[-1], stack[m], stack[m+1]))
+        return triangles
+
+
     def __repr__(self):
         return 'Triangulation Class for Polygon'
+
+
+class TriangleMesh(object):
+    """
+    Indexed triangle mesh.  vertices is a flat array('d') [x0, y0,
+    x1, y1, ...] holding every vertice once, and indices an array of
+    32 bit integers [a0, b0, c0, a1, ...], triangle k being vertices
+    a_k, b_k and c_k, the same way round as the polygon.  The views
+    expose both as (n, 2) float64 and (m, 3) int32 buffers without
+    copying, e.g. for numpy.asarray.
+    """
+
+    def __init__(self, vertices, indices):
+        self.vertices = vertices
+        self.indices  = indices
+
+
+    def __len__(self):
+        return len(self.indices) // 3
+
+
+    def vertice_number(self):
+        return len(self.vertices) // 2
+
+
+    def coordinate(self, index):
+        return (self.vertices[2*index], self.vertices[2*index+1])
+
+
+    def triangle(self, k):
+        """ Coordinates of triangle k, as Triangulate.triangulate gives them """
+        return [self.coordinate(self.indices[3*k+m]) for m in xrange(3)]
+
+
+    def __iter__(self):
+        for k in xrange(len(self)):
+            yield self.triangle(k)
+
+    def neighbours(self):
+        """
+        Triangle adjacency, by corner: entry 3*k + m is the corner,
+        numbered the same way, facing corner m of triangle k across the
+        side opposite it, or -1 if that side is on the border.
+        """
+        indices   = self.indices
+        neighbour = array('l', [-1])*len(indices)
+        sides     = {}
+        for corner in xrange(len(indices)):
+            base = corner - corner % 3
+            a    = indices[base + (corner + 1) % 3]
+            b    = indices[base + (corner + 2) % 3]
+            key  = (a, b) if a < b else (b, a)
+            other = sides.pop(key, None)
+            if other is None:
+                sides[key] = corner
+            else:
+                neighbour[corner] = other
+                neighbour[other]  = corner
+        return neighbour
+
+
+    def make_delaunay(self):
+        """
+        Lawson's algorithm: flips the diagonal of any two triangles
+        whose circumcircle holds the far corner of the other, until
+        none does.  Only sides shared by two triangles are flipped, so
+        for the triangulation of a polygon the polygon's edges stay and
+        the result is its constrained Delaunay triangulation.  Each
+        flip is O(1) on the adjacency of neighbours, after which the
+        four sides around it are checked again.  Edits self.indices in
+        place and returns the number of flips.
+        """
+        indices   = self.indices
+        neighbour = self.neighbours()
+        vertice   = self.coordinate
+        pending   = [corner for corner in xrange(len(indices))
+                     if corner < neighbour[corner]]
+        waiting   = bytearray(len(indices))
+        for corner in pending:
+            waiting[corner] = 1
+
+        flips = 0
+        while pending:
+            corner = pending.pop()
+            waiting[corner] = 0
+            facing = neighbour[corner]
+            if facing < 0:
+                continue
+            """
+            Triangle (p, r, s) with p at corner, and (q, s, r) with q
+            at facing, become (p, r, q) and (q, s, p).
+            """
+            base, other = corner - corner % 3, facing - facing % 3
+            t_1, t_2    = base + (corner + 1) % 3, base + (corner + 2) % 3
+            u_1, u_2    = other + (facing + 1) % 3, other + (facing + 2) % 3
+            p, r, s, q  = (vertice(indices[corner]), vertice(indices[t_1]),
+                           vertice(indices[t_2]), vertice(indices[facing]))
+            sign = lineintersection.orientation(p, r, s)
+            if (in_circle(p, r, s, q)*sign <= 0 or
+                lineintersection.orientation(p, r, q)*sign <= 0 or
+                lineintersection.orientation(q, s, p)*sign <= 0):
+                continue
+
+            across_sp, across_rq = neighbour[t_1], neighbour[u_1]
+            indices[t_2], indices[u_2] = indices[facing], indices[corner]
+            neighbour[corner] = across_rq
+            neighbour[facing] = across_sp
+            if across_rq >= 0:
+                neighbour[across_rq] = corner
+            if across_sp >= 0:
+                neighbour[across_sp] = facing
+            neighbour[t_1], neighbour[u_1] = u_1, t_1
+            flips += 1
+            for side in (corner, t_2, facing, u_2):
+                if not waiting[side]:
+                    waiting[side] = 1
+                    pending.append(side)
+        return flips
+
+
+    def quality(self):
+        """
+        Shape of the triangles, as a dictionary: min_angle, the
+        smallest angle of any triangle, and mean_min_angle, the mean of
+        each triangle's smallest angle (both in degrees), and
+        max_radius_edge, the largest ratio of a triangle's circumradius
+        to its shortest side (1/sqrt(3) for an equilateral one, and
+        infinite for a flat one).
+        """
+        smallest, total, worst = 180.0, 0.0, 0.0
+        for a, b, c in self:
+            sides = sorted(math.hypot(q[0] - p[0], q[1] - p[1])
+                           for p, q in ((a, b), (b, c), (c, a)))
+            area  = abs((b[0] - a[0])*(c[1] - a[1]) - (b[1] - a[1])*(c[0] - a[0]))/2.0
+            short, middle, longest = sides
+            cosine = (middle**2 + longest**2 - short**2)/(2*middle*longest)
+            angle  = math.degrees(math.acos(max(-1.0, min(1.0, cosine))))
+            smallest = min(smallest, angle)
+            total   += angle
+            worst    = max(worst, middle*longest/(4*area) if area else float('inf'))
+        return {'min_angle':       smallest,
+                'mean_min_angle':  total/len(self),
+                'max_radius_edge': worst}
+
+    """
+    The following export the arrays through the buffer protocol,
+    which array.array lacks in Python 2, by laying ctypes arrays over
+    their memory.  A view shares the memory of its array, so the array
+    must not grow or shrink while the view is in use.
+    """
+
+    def vertex_view(self):
+        """ memoryview of the vertices, shape (n, 2), format float64 """
+        shape = (ctypes.c_double*2)*self.vertice_number()
+        return memoryview(shape.from_buffer(self.vertices))
+
+
+    def index_view(self):
+        """ memoryview of the indices, shape (m, 3), format int32 """
+        shape = (ctypes.c_int32*3)*len(self)
+        return memoryview(shape.from_buffer(self.indices))
+
+
+    def __repr__(self):
+        return 'Mesh of %s triangles on %s vertices' % (len(self),
+                                                        self.vertice_number())
+
+
+def _lifted_determinant(a, b, c, d):
+    """ The in_circle determinant, and the sum of its terms' magnitudes """
+    adx, ady = a[0] - d[0], a[1] - d[1]
+    bdx, bdy = b[0] - d[0], b[1] - d[1]
+    cdx, cdy = c[0] - d[0], c[1] - d[1]
+    a_lift   = adx*adx + ady*ady
+    b_lift   = bdx*bdx + bdy*bdy
+    c_lift   = cdx*cdx + cdy*cdy
+    determinant = (a_lift*(bdx*cdy - bdy*cdx) + b_lift*(cdx*ady - cdy*adx) +
+                   c_lift*(adx*bdy - ady*bdx))
+    scale = (a_lift*(abs(bdx*cdy) + abs(bdy*cdx)) +
+             b_lift*(abs(cdx*ady) + abs(cdy*adx)) +
+             c_lift*(abs(adx*bdy) + abs(ady*bdx)))
+    return determinant, scale
+
+
+def in_circle(a, b, c, d):
+    """
+    1 if d lies inside the circle through a, b and c, taken counter-
+    clockwise, -1 if outside and 0 if on it.  Floating point is only
+    trusted when the determinant is large against its terms, as in
+    lineintersection.float_orientation; otherwise it is recomputed
+    exactly with Fractions, so that cocircular points come out as 0
+    and edge flipping always ends.
+    """
+    determinant, scale = _lifted_determinant(a, b, c, d)
+    if abs(determinant) <= 1e-12*scale:
+        determinant = _lifted_determinant(
+                          *[(Fraction(p[0]), Fraction(p[1])) for p in (a, b, c, d)])[0]
+    return (determinant > 0) - (determinant < 0)
+
+
+def _sweep_key(coord):
+    """ Sweep order of the monotone engine: top down, then left to right """
+    return (-coord[1], coord[0])
+
+
+def _ear_entry(coords, prev, tip, following):
+    """
+    Heap entry for the ear at tip of the index ring: the squared
+    length of its diagonal first, then the indices of its corners.
+    """
+    (a_x, a_y), (c_x, c_y) = coords[prev], coords[following]
+    return ((c_x - a_x)**2 + (c_y - a_y)**2, prev, tip, following)
+
+
+def _runs_along(coord, end, other_end):
+    """
+    True if coord, the ring neighbour of end across from the ear,
+    lies on the diagonal from end to other_end.
+    """
+    return (lineintersection.orientation(end, other_end, coord) == 0 and
+            (coord[0] - end[0])*(other_end[0] - coord[0]) >= 0 and
+            (coord[1] - end[1])*(other_end[1] - coord[1]) >= 0)
+
+
+def _simple_polygon(coordinates):
+    """ Triangulate.__init__ has a polygon argument hiding the module """
+    return polygon.SimplePolygon(coordinates)
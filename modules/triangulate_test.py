@@ -0,0 +1,178 @@
+"""
+This file contains test methods for triangulate.py.
+"""
+
+import unittest
+import random
+import math
+
+import polygon
+import triangulate
+import lineintersection
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+
+def comb(teeth):
+    """ Comb with teeth pointing up, each tooth a reflex notch """
+    coordinates = [(0, 0), (2*teeth, 0)]
+    for k in xrange(teeth, 0, -1):
+        coordinates.extend([(2*k, 3), (2*k - 1, 1)])
+    coordinates[-1] = (0, 3)
+    return coordinates
+
+
+def star(points, seed = 0):
+    """ Star-shaped polygon with random radii at sorted random angles """
+    generator = random.Random(seed)
+    angles    = sorted(generator.uniform(0, 2*math.pi) for _ in xrange(points))
+    radii     = [generator.uniform(1, 10) for _ in xrange(points)]
+    return [(round(radius*math.cos(angle), 6), round(radius*math.sin(angle), 6))
+            for angle, radius in zip(angles, radii)]
+
+
+class TestTriangulate(unittest.TestCase):
+
+    examples = [[(0,0),(0,1),(1,1),(1,0)], [(0,0),(0,2),(1,1),(2,2),(2,0)],
+                [(0,0),(4,0),(4,4),(3,4),(3,1),(1,1),(1,4),(0,4)],
+                [(0,0),(2,0),(2,1),(1,1),(1,2),(3,2),(3,3),(0,3)],
+                comb(6), star(40), [(0,1),(4,4),(3,1),(2,1),(1,1)]]
+
+    def assertTriangulates(self, coordinates, triangles):
+
+        pgon  = polygon.SimplePolygon(list(coordinates))
+        edges = pgon.get_edges()
+        self.assertEqual(len(triangles), len(coordinates) - 2)
+        area  = 0.0
+        for triangle in triangles:
+            for coord in triangle:
+                self.assertTrue(coord in coordinates)
+            area += abs(polygon.buffer_signed_area(
+                            polygon.flatten_coordinates(triangle)))
+            """ Diagonals may not cross the border """
+            for k in xrange(3):
+                side = [triangle[k], triangle[(k+1) % 3]]
+                for edge in edges:
+                    if set(side) & set(edge):
+                        continue
+                    self.assertFalse(lineintersection.segments_intersect(side, edge))
+        self.assertAlmostEqual(area, pgon.total_area())
+
+    def test_examples(self):
+
+        for example in TestTriangulate.examples:
+            for coordinates in (example, example[::-1]):
+                for engine in (triangulate.ENGINE_EAR, triangulate.ENGINE_MONOTONE):
+                    triangles = triangulate.Triangulate(list(coordinates),
+                                                        engine = engine).triangulate()
+                    self.assertTriangulates(coordinates, triangles)
+
+    def test_monotone(self):
+
+        """ Split and merge vertices, and horizontal edges """
+        coordinates = [(0,0),(2,1),(4,0),(4,3),(3,3),(2,2),(1,3),(0,3)]
+        pgon = polygon.SimplePolygon(coordinates)
+        T    = triangulate.Triangulate([], pgon, triangulate.ENGINE_MONOTONE)
+        self.assertTriangulates(coordinates, T.triangulate())
+        self.assertEqual(list(pgon.ring()), coordinates)
+        self.assertRaises(ValueError, triangulate.Triangulate, coordinates,
+                          None, 'quadtree')
+
+    def test_convex_fan(self):
+
+        circle = [(round(10*math.cos(k*math.pi/50), 6), round(10*math.sin(k*math.pi/50), 6))
+                  for k in xrange(100)]
+        for coordinates in (circle, circle[::-1]):
+            pgon = polygon.SimplePolygon(list(coordinates))
+            T    = triangulate.Triangulate([], pgon)
+            self.assertTriangulates(coordinates, T.triangulate())
+            self.assertTrue(T.convex_fast_path)
+            self.assertEqual(pgon.vertice_number, len(coordinates))
+
+        T = triangulate.Triangulate(comb(3))
+        T.triangulate()
+        self.assertFalse(T.convex_fast_path)
+
+    def test_mesh(self):
+
+        for coordinates in (comb(5), star(30), [(0,0),(0,1),(1,1),(1,0)]):
+            for engine in (triangulate.ENGINE_EAR, triangulate.ENGINE_MONOTONE):
+                pgon = polygon.SimplePolygon(list(coordinates))
+                mesh = triangulate.Triangulate([], pgon, engine).mesh()
+                self.assertEqual(len(mesh), len(coordinates) - 2)
+                self.assertEqual(mesh.vertice_number(), len(coordinates))
+                self.assertEqual(list(mesh.vertices),
+                                 list(polygon.flatten_coordinates(list(pgon.ring()))))
+                self.assertEqual(list(mesh), triangulate.Triangulate(
+                                     [], pgon, engine).triangulate())
+
+                vertices, indices = mesh.vertex_view(), mesh.index_view()
+                self.assertEqual((vertices.shape, vertices.itemsize), ((len(coordinates), 2), 8))
+                self.assertEqual((indices.shape, indices.itemsize), ((len(mesh), 3), 4))
+                if numpy is not None:
+                    triangles = numpy.asarray(indices)
+                    self.assertEqual(triangles.dtype, numpy.int32)
+                    self.assertEqual(triangles.tolist(), [list(mesh.indices[3*k:3*k+3])
+                                                          for k in xrange(len(mesh))])
+                    """ The view shares the mesh's memory """
+                    numpy.asarray(vertices)[0, 0] = 100.0
+                    self.assertEqual(mesh.vertices[0], 100.0)
+
+    def test_delaunay(self):
+
+        self.assertEqual(triangulate.in_circle((0,0),(1,0),(1,1),(0,1)), 0)
+        self.assertEqual(triangulate.in_circle((0,0),(1,0),(0,1),(0.9,0.9)), 1)
+        self.assertEqual(triangulate.in_circle((0,0),(0,1),(1,0),(0.9,0.9)), -1)
+
+        for coordinates in (comb(5), star(200, 2), star(200, 2)[::-1]):
+            meshes = []
+            for engine in (triangulate.ENGINE_EAR, triangulate.ENGINE_MONOTONE):
+                T      = triangulate.Triangulate(coordinates, engine = engine)
+                before = T.mesh().quality()
+                mesh   = T.delaunay()
+                self.assertTriangulates(coordinates, list(mesh))
+                self.assertTrue(T.flips > 0)
+                """ Flipping to Delaunay never makes the smallest angle smaller """
+                self.assertTrue(mesh.quality()['min_angle'] >= before['min_angle'])
+
+                neighbour = mesh.neighbours()
+                for corner in xrange(len(mesh.indices)):
+                    if neighbour[corner] >= 0:
+                        base     = corner - corner % 3
+                        triangle = [mesh.coordinate(mesh.indices[base + m]) for m in xrange(3)]
+                        if lineintersection.orientation(*triangle) < 0:
+                            triangle.reverse()
+                        far = mesh.coordinate(mesh.indices[neighbour[corner]])
+                        self.assertTrue(triangulate.in_circle(*(triangle + [far])) <= 0)
+                meshes.append(set(frozenset(triangle) for triangle in mesh))
+            """ Without four points on a circle, the triangulation is unique """
+            self.assertEqual(meshes[0], meshes[1])
+
+    def test_polygon_argument(self):
+
+        for storage in (polygon.STORAGE_LINKED, polygon.STORAGE_ARRAY):
+            pgon = polygon.SimplePolygon(comb(3), storage = storage)
+            T    = triangulate.Triangulate([], pgon)
+            triangles = T.triangulate()
+            self.assertTriangulates(comb(3), triangles)
+            """ The polygon is left as it was """
+            self.assertEqual(list(pgon.ring()), comb(3))
+            self.assertEqual(pgon.vertice_number, len(comb(3)))
+            self.assertRaises(ValueError, T.triangulate)
+            T.reset()
+            self.assertEqual(T.triangulate(), triangles)
+
+    def test_large(self):
+
+        for coordinates in (star(5000, 1), comb(2500)):
+            for engine in (triangulate.ENGINE_EAR, triangulate.ENGINE_MONOTONE):
+                triangles = triangulate.Triangulate(coordinates,
+                                                    engine = engine).triangulate()
+                self.assertEqual(len(triangles), len(coordinates) - 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,246 @@
+"""
+Validation Module for Geometry Package
+
+Checks that every polygon of a large dataset is simple, or finds the
+intersections among a huge number of lines, spread over a pool of
+worker processes.
+"""
+import bisect
+import multiprocessing
+from array import array
+from multiprocessing import sharedctypes
+
+import numpy
+
+import collection
+import lineintersection
+
+
+""" Set in each worker process by _share, so tasks only carry indices """
+_shared = {}
+
+
+def _share(arrays):
+    _shared.update(arrays)
+
+
+def _pooled(job):
+    """ Worker side of _run: the task, given the worker's shared arrays """
+    task, arguments = job
+    return task(arguments, _shared)
+
+
+def _raw_array(values):
+    """ Copy of an array('d'/'l') or ndarray in shared memory """
+    if isinstance(values, array):
+        values = numpy.frombuffer(values, values.typecode)
+    raw = sharedctypes.RawArray(values.dtype.char, len(values))
+    numpy.frombuffer(raw, values.dtype)[:] = values
+    return raw
+
+
+def _run(task, tasks, arrays, processes):
+    """
+    Yields task(arguments, arrays) for each arguments in tasks, in
+    order, from a pool of processes sharing arrays (see _share), or in
+    this process if one process, or one task, is all there is.  The
+    serial path hands arrays straight to task, so any number of runs
+    can be under way at once.
+    """
+    if processes == 1 or len(tasks) <= 1:
+        for arguments in tasks:
+            yield task(arguments, arrays)
+        return
+
+    shared = dict((name, _raw_array(values))
+                  for name, values in arrays.iteritems())
+    pool = multiprocessing.Pool(processes, _share, (shared,))
+    try:
+        for result in pool.imap(_pooled, [(task, arguments)
+                                          for arguments in tasks]):
+            yield result
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def ring_edges(coordinates, start, stop):
+    """
+    Edges [(x1,y1), (x2,y2)] of the ring held in coordinates from
+    vertice start up to stop, edge i running from vertice i to i + 1.
+    """
+    flat   = coordinates[2*start:2*stop]
+    flat   = flat.tolist() if hasattr(flat, 'tolist') else flat
+    points = zip(flat[0::2], flat[1::2])
+    return [[points[i], points[(i + 1) % len(points)]]
+            for i in xrange(len(points))]
+
+
+def least_pair(LI):
+    """
+    The least (i, j), i < j, of the intersecting pairs among the lines
+    of LI, labelled by their indices, or None.  All the intersections
+    are swept for (see LineIntersection.sweep_pairs), so the pair does
+    not depend on how, or in what order, they were looked for.
+    """
+    return min([tuple(sorted((int(labelA), int(labelB))))
+                for labelA, labelB, point in LI.sweep_pairs()] or [None])
+
+
+def check_ring(coordinates, start, stop):
+    """
+    (True, None) if the ring is simple, else (False, (i, j)) with
+    (i, j) the least pair of indices, i < j, of edges that intersect.
+    A simple ring costs one simplicity test; only a ring that isn't
+    pays for finding all its k intersections, O((n + k) log n).
+    """
+    LI = lineintersection.LineIntersection(ring_edges(coordinates, start, stop))
+    if not LI.general_intersection():
+        return True, None
+    return False, least_pair(LI)
+
+
+def _check_range(task, arrays):
+    """ Worker task: verdicts for rings first up to last """
+    first, last = task
+    coordinates, offsets = arrays['coordinates'], arrays['offsets']
+    return [(index,) + check_ring(coordinates, offsets[index], offsets[index+1])
+            for index in xrange(first, last)]
+
+
+def validate_simple(polygons, processes = None, chunk_size = 256):
+    """
+    Yields (index, simple, edge pair) for every polygon, in order:
+    simple is polygon_is_simple's verdict and edge pair is None, or
+    for a polygon that isn't simple the least pair of indices (i, j)
+    of edges that intersect (see check_ring), counted from the
+    polygon's first vertice as given.
+
+    polygons is a collection.PolygonCollection or an iterable of rings
+    (coordinate lists or flat buffers).  Their coordinates are copied
+    once into shared memory that the worker processes inherit, and the
+    work is handed out as ranges of chunk_size polygons, so nothing
+    is pickled but the ranges and the verdicts.  Results stream back
+    as chunks finish.  processes defaults to the number of CPUs; with
+    one process, or a single chunk of work, no pool is started.
+    """
+    if not isinstance(polygons, collection.PolygonCollection):
+        polygons = collection.PolygonCollection(polygons)
+    if chunk_size < 1:
+        raise ValueError('Chunk size must be positive')
+
+    number = len(polygons)
+    tasks  = [(first, min(first + chunk_size, number))
+              for first in xrange(0, number, chunk_size)]
+    arrays = {'coordinates': polygons.coordinates, 'offsets': polygons.offsets}
+    for verdicts in _run(_check_range, tasks, arrays,
+                         processes or multiprocessing.cpu_count()):
+        for verdict in verdicts:
+            yield verdict
+
+"""
+The following split the lines of one huge problem into vertical
+strips, each swept on its own.  A line goes to every strip its x range
+overlaps, so each strip holds every line passing through it and finds
+every intersection inside it.  An intersection is kept only by the
+strip its point (see lineintersection.meeting_point) falls in, strip k
+covering bounds[k-1] <= x < bounds[k], so none is lost or repeated.
+"""
+
+def strip_bounds(segments, strips):
+    """
+    Up to strips - 1 borders between strips, at quantiles of the x of
+    the segment midpoints, from a flat buffer [x1, y1, x2, y2, ...].
+    At most about 100000 segments are sampled.
+    """
+    number = len(segments) // 4
+    stride = max(number // 100000, 1)
+    middle = sorted(segments[4*i] + segments[4*i+2]
+                    for i in xrange(0, number, stride))
+    bounds = []
+    for k in xrange(1, strips):
+        bound = middle[k*len(middle) // strips]/2.0 if middle else 0.0
+        if not bounds or bound > bounds[-1]:
+            bounds.append(bound)
+    return bounds
+
+
+def strip_tasks(segments, bounds, every):
+    """ (low, high, indices, every) for each strip holding segments """
+    members = [array('l') for _ in xrange(len(bounds) + 1)]
+    for i in xrange(len(segments) // 4):
+        low, high = sorted((segments[4*i], segments[4*i+2]))
+        for k in xrange(bisect.bisect_right(bounds, low),
+                        bisect.bisect_right(bounds, high) + 1):
+            members[k].append(i)
+    edges = [None] + bounds + [None]
+    return [(edges[k], edges[k+1], members[k], every)
+            for k in xrange(len(members)) if members[k]]
+
+
+def _sweep_strip(task, arrays):
+    """
+    Worker task: sweeps one strip's lines, labelled by their index
+    among all the lines.  Returns the intersections whose points fall
+    in the strip or, if not every, at most one pair: the least pair
+    of intersecting lines in the strip (see least_pair).
+    """
+    low, high, indices, every = task
+    segments = arrays['segments']
+    LI = lineintersection.LineIntersection([])
+    for i in indices:
+        LI.add_line([(segments[4*i], segments[4*i+1]),
+                     (segments[4*i+2], segments[4*i+3])], str(i))
+    if not every:
+        if LI.sweep_intersection():
+            return [least_pair(LI)]
+        return []
+
+    found = []
+    for labelA, labelB, point in LI.sweep_pairs():
+        x = lineintersection.meeting_point(LI.lines[labelA], LI.lines[labelB])[0]
+        if (low is None or low <= x) and (high is None or x < high):
+            found.append((int(labelA), int(labelB), point))
+    return found
+
+
+def _strip_work(lines, processes, strips, every):
+    segments = array('d')
+    for line in lines:
+        segments.extend((line[0][0], line[0][1], line[1][0], line[1][1]))
+    processes = processes or multiprocessing.cpu_count()
+    tasks     = strip_tasks(segments, strip_bounds(segments, strips or processes),
+                            every)
+    return _run(_sweep_strip, tasks, {'segments': segments}, processes)
+
+
+def strip_intersections(lines, processes = None, strips = None):
+    """
+    Yields (lineA, lineB, point) for every intersection among lines,
+    exactly as LineIntersection(lines).sweep_intersections() does and
+    in the same order, with the strips (processes of them by default)
+    swept in parallel.  Lines are sent to the workers in shared memory
+    and each strip's answers come back as it finishes, in x order.
+    """
+    lines = list(lines)
+    for found in _strip_work(lines, processes, strips, True):
+        for i, j, point in found:
+            yield lines[i], lines[j], point
+
+
+def validate_ring(ring, processes = None, strips = None):
+    """
+    The verdict of check_ring on one huge ring, (True, None) or (False,
+    (i, j)) with the same least pair, from a Shamos-Hoey sweep per
+    strip run in parallel.  Every intersecting pair of edges meets in
+    some strip that holds them both, so the least of the strips' least
+    pairs is the ring's.
+    """
+    coordinates = collection.PolygonCollection([ring]).coordinates
+    edges       = ring_edges(coordinates, 0, len(coordinates) // 2)
+    pairs       = [found[0] for found in _strip_work(edges, processes,
+                                                     strips, False) if found]
+    if pairs:
+        return False, min(pairs)
+    return True, None
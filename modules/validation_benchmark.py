@@ -0,0 +1,30 @@
+"""
+Times validation.validate_simple on one process and on a pool.
+
+    python validation_benchmark.py [processes ...]
+
+Rings are big enough for the sweep to outweigh the pool's start up.
+"""
+import sys
+import math
+import time
+
+import collection
+import validation
+
+
+def benchmark(process_counts, number = 150, size = 1000, chunk_size = 25):
+    ring  = [(math.cos(2*k*math.pi/size), math.sin(2*k*math.pi/size))
+             for k in xrange(size)]
+    rings = collection.PolygonCollection([ring]*number)
+    for processes in process_counts:
+        start = time.time()
+        for index, simple, pair in validation.validate_simple(
+                rings, processes, chunk_size):
+            if not simple:
+                raise ValueError('Ring %d should be simple' % index)
+        print '%d process(es): %.2fs' % (processes, time.time() - start)
+
+
+if __name__ == '__main__':
+    benchmark([int(argument) for argument in sys.argv[1:]] or [1, 2])
@@ -0,0 +1,121 @@
+"""
+This file contains test methods for validation.py.
+"""
+
+import unittest
+import random
+import math
+from array import array
+from itertools import chain
+
+import validation
+import lineintersection
+import collection
+import polygon
+
+
+
+class TestValidation(unittest.TestCase):
+
+    square = [(0,0),(0,1),(1,1),(1,0)]
+    bowtie = [(0,0),(1,1),(1,0),(0,1)]
+
+    def dataset(self, number):
+        rings = []
+        for i in xrange(number):
+            x, y = random.uniform(0, 100), random.uniform(0, 100)
+            ring = random.choice((TestValidation.square, TestValidation.bowtie))
+            rings.append([(x + a, y + b) for a, b in ring])
+        return rings
+
+    def test_verdicts(self):
+
+        rings    = self.dataset(50)
+        verdicts = list(validation.validate_simple(rings, processes = 1))
+        self.assertEqual([verdict[0] for verdict in verdicts], range(50))
+        for ring, (index, simple, pair) in zip(rings, verdicts):
+            self.assertEqual(simple, polygon.SimplePolygon(
+                ring, validation = polygon.VALIDATE_NONE).polygon_is_simple())
+            """ The bowtie's crossing edges are its first and third """
+            self.assertEqual(pair, None if simple else (0, 2))
+
+    def test_pool_matches_serial(self):
+
+        rings  = collection.PolygonCollection(self.dataset(40))
+        serial = list(validation.validate_simple(rings, processes = 1))
+        pooled = list(validation.validate_simple(rings, processes = 2,
+                                                 chunk_size = 7))
+        self.assertEqual(serial, pooled)
+        self.assertEqual(list(validation.validate_simple([], processes = 2)), [])
+
+    def test_serial_runs_interleave(self):
+
+        squares = validation.validate_simple([TestValidation.square]*3,
+                                             processes = 1, chunk_size = 1)
+        bowties = validation.validate_simple([TestValidation.bowtie]*3,
+                                             processes = 1, chunk_size = 1)
+        self.assertEqual(next(squares), (0, True, None))
+        self.assertEqual(next(bowties), (0, False, (0, 2)))
+        self.assertEqual(next(squares), (1, True, None))
+        self.assertEqual(list(bowties), [(1, False, (0, 2)), (2, False, (0, 2))])
+        self.assertEqual(next(squares), (2, True, None))
+        self.assertEqual(validation._shared, {})
+
+    def test_strips_match_serial_sweep(self):
+
+        lines = [[(random.randint(0, 30), random.randint(0, 30)),
+                  (random.randint(0, 30), random.randint(0, 30))]
+                 for i in xrange(60)]
+        serial = list(lineintersection.LineIntersection(lines)
+                      .sweep_intersections())
+        for processes, strips in ((1, 5), (2, 3)):
+            self.assertEqual(list(validation.strip_intersections(
+                                 lines, processes, strips)), serial)
+
+    def test_strips_interleave(self):
+
+        lines  = [[(0,0),(4,4)], [(0,4),(4,0)], [(1,0),(1,4)], [(3,0),(3,4)]]
+        serial = list(lineintersection.LineIntersection(lines)
+                      .sweep_intersections())
+        squares   = validation.validate_simple([TestValidation.square]*2,
+                                               processes = 1, chunk_size = 1)
+        crossings = validation.strip_intersections(lines, 1, 3)
+        self.assertEqual(next(squares), (0, True, None))
+        first = next(crossings)
+        self.assertEqual(validation.validate_ring(TestValidation.bowtie, 1, 1),
+                         (False, (0, 2)))
+        self.assertEqual(next(squares), (1, True, None))
+        self.assertEqual([first] + list(crossings), serial)
+
+    def test_validate_ring(self):
+
+        """ A star, simple, then with one spike pulled through another """
+        star = [(math.cos(k*math.pi/20)*(3 if k % 2 else 1),
+                 math.sin(k*math.pi/20)*(3 if k % 2 else 1))
+                for k in xrange(40)]
+        self.assertEqual(validation.validate_ring(star, 1, 4), (True, None))
+        star[1] = (-3, 0.1)
+        self.assertEqual(validation.validate_ring(star, 2, 4),
+                         validation.check_ring(array('d', chain(*star)), 0, 40))
+
+        """ Random rings cross many times; the pair is the least one """
+        for trial in xrange(5):
+            ring  = [(random.randint(0, 50), random.randint(0, 50))
+                     for i in xrange(20)]
+            flat  = array('d', chain(*ring))
+            edges = validation.ring_edges(flat, 0, 20)
+            least = min([(i, j) for i in xrange(20) for j in xrange(i + 1, 20)
+                         if lineintersection.segments_intersect(edges[i],
+                                                                edges[j])]
+                        or [None])
+            serial = validation.check_ring(flat, 0, 20)
+            self.assertEqual(serial, (least is None, least))
+            pool = 2 if trial < 2 else 1
+            for processes, strips in ((1, 1), (1, 5), (pool, 3)):
+                self.assertEqual(validation.validate_ring(ring, processes,
+                                                          strips), serial)
+
+
+
+if __name__ == '__main__':
+    unittest.main()